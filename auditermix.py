@@ -11,19 +11,41 @@ Zero-arg launch:  python auditermix.py
 uv launch:        uv run auditermix.py
 """
 
+from __future__ import annotations
+
+import time
+_T0 = time.perf_counter()        # --startup-time measures from here
+
 __version__ = "1.0.0"
 __app__     = "auditermix"
 
+import argparse
+import hashlib
 import itertools
+import json
+import math
 import os
+import random
 import re
 import shutil
+import signal
+import sqlite3
+import subprocess
 import sys
+import tempfile
 import threading
-import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlparse
 
-from yt_dlp import YoutubeDL
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from types import ModuleType
+
+    from yt_dlp import YoutubeDL
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -75,6 +97,9 @@ _JS_RE = re.compile(
 
 _DRM_RE = re.compile(r"DRM.?protected|drm", re.IGNORECASE)
 
+_FRAG_RETRY_RE = re.compile(r"Retrying fragment|Giving up after .* fragment", re.IGNORECASE)
+_THROTTLE_RE   = re.compile(r"HTTP Error 429|Too Many Requests", re.IGNORECASE)
+
 _js_warned = False   # surface JS-challenge hint only once per session
 
 
@@ -87,12 +112,21 @@ def _strip_prefix(msg: str) -> str:
 
 
 class SilentLogger:
+    def __init__(self, on_fragment_retry: Callable[[], None] | None = None,
+                 on_throttle: Callable[[], None] | None = None) -> None:
+        self._on_fragment_retry = on_fragment_retry
+        self._on_throttle       = on_throttle
+
     def debug(self, _: str) -> None:   pass
     def info(self,  _: str) -> None:   pass
 
     def warning(self, msg: str) -> None:
         global _js_warned
         clean = _strip_prefix(msg)
+        if self._on_fragment_retry and _FRAG_RETRY_RE.search(clean):
+            self._on_fragment_retry()
+        if self._on_throttle and _THROTTLE_RE.search(clean):
+            self._on_throttle()
         if _JS_RE.search(clean):
             if not _js_warned:
                 _js_warned = True
@@ -107,53 +141,227 @@ class SilentLogger:
 
     def error(self, msg: str) -> None:
         clean = _strip_prefix(msg)
+        if self._on_throttle and _THROTTLE_RE.search(clean):
+            self._on_throttle()
         if _MUTED.search(clean):
             return
         _print_error(clean)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-#  SPINNER
+#  YT-DLP — imported on first use, not at startup
+#  Importing yt-dlp and building its extractor registry costs far more than
+#  the rest of startup combined. --help, the settings prompts and a queue
+#  that is already fully archived never need it, so nothing touches yt_dlp
+#  until the first YoutubeDL is built.
+# ══════════════════════════════════════════════════════════════════════════════
+
+_yt_dlp_mod: ModuleType | None = None
+_LOAD_S: dict[str, float] = {}       # first-use cost of each step, for --startup-time
+
+def _yt_dlp() -> ModuleType:
+    global _yt_dlp_mod
+    if _yt_dlp_mod is None:
+        t0 = time.perf_counter()
+        import yt_dlp
+        _LOAD_S.setdefault("import yt-dlp", time.perf_counter() - t0)
+        _yt_dlp_mod = yt_dlp
+    return _yt_dlp_mod
+
+def new_ydl(params: dict) -> YoutubeDL:
+    """YoutubeDL(params); the first call also pays for the extractor registry."""
+    ydl_cls = _yt_dlp().YoutubeDL
+    t0      = time.perf_counter()
+    ydl     = ydl_cls(params)
+    _LOAD_S.setdefault("extractor registry", time.perf_counter() - t0)
+    return ydl
+
+def sanitize_info(info: dict) -> dict:
+    return _yt_dlp().YoutubeDL.sanitize_info(info)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  RENDERER — owns the live region at the bottom of the terminal
+#  The region is the attached panel (LiveQueue) plus one status line for a
+#  spinner or progress bar. Everything else is logged *above* it through
+#  _out(), so nothing ever needs to know how many lines were printed.
+#  Producers only record what they want shown; the render thread draws the
+#  latest of it at most once per frame and rewrites only changed lines.
 # ══════════════════════════════════════════════════════════════════════════════
 
 _BRAILLE = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+FRAME_S  = 0.08            # frame cap — also the spinner's step
 
 
-class Spinner:
-    """Thread-safe terminal spinner."""
+class Renderer:
+    """
+    Thread-safe owner of the live region. status()/spin()/redraw() may be
+    called from any thread and are coalesced into the next frame; log(),
+    commit(), clear() and flush() act synchronously under _OUT_LOCK.
 
-    def __init__(self, label: str) -> None:
-        self.label   = label
-        self._stop   = threading.Event()
-        self._thread = threading.Thread(target=self._loop, daemon=True)
+    The cursor always rests at the start of the line below the region.
+    On non-TTY output there is no region: log() is plain printing and
+    transient frames are dropped.
+    """
 
-    def _loop(self) -> None:
-        for frame in itertools.cycle(_BRAILLE):
-            if self._stop.is_set():
-                break
-            sys.stdout.write(f"\r  {orange(frame)}  {smoke(self.label)}   ")
+    def __init__(self) -> None:
+        self._wake    = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._status: tuple[Callable[..., str], tuple] | None = None
+        self._spin    = ""
+        self._frame   = 0
+        self._panel   = None
+        self._shown: list[str] = []       # region lines currently on screen
+
+    def _kick(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def status(self, fn: Callable[..., str], *args) -> None:
+        """Show fn(*args) on the status line — evaluated at draw time."""
+        if _TTY:
+            self._status, self._spin = (fn, args), ""
+            self._kick()
+
+    def spin(self, label: str) -> None:
+        if _TTY:
+            self._status, self._spin = None, label
+            self._kick()
+
+    def redraw(self) -> None:
+        if _TTY:
+            self._kick()
+
+    def attach(self, panel) -> None:
+        with _OUT_LOCK:
+            self._panel = panel
+            self._paint()
+
+    def detach(self, panel) -> None:
+        """Draw panel's final frame and leave it behind as plain output."""
+        with _OUT_LOCK:
+            if self._panel is panel:
+                self._paint()
+                self._panel, self._shown = None, []
+
+    def log(self, text: str = "") -> None:
+        """
+        Print text above the live region. The region is wiped and comes
+        back on the next frame, so a burst of log lines costs one repaint.
+        """
+        with _OUT_LOCK:
+            if self._shown:
+                sys.stdout.write(f"\r\033[{len(self._shown)}A\033[J")
+                self._shown = []
+                self._kick()
+            sys.stdout.write(text + "\n")
             sys.stdout.flush()
-            time.sleep(0.08)
+
+    def commit(self, line: str) -> None:
+        """Replace the status line with a permanent line."""
+        with _OUT_LOCK:
+            self._status, self._spin = None, ""
+            self.log(line)
+
+    def clear(self) -> None:
+        with _OUT_LOCK:
+            if self._status or self._spin:
+                self._status, self._spin = None, ""
+                self._paint()
+
+    def flush(self) -> None:
+        with _OUT_LOCK:
+            self._paint()
+
+    def _loop(self) -> None:
+        while True:
+            self._wake.wait()
+            with _OUT_LOCK:
+                if not self._spin:        # a spinner keeps the loop ticking
+                    self._wake.clear()
+                self._paint()
+            time.sleep(FRAME_S)
+
+    def _region(self) -> list[str]:
+        lines = self._panel.lines() if self._panel else []
+        if self._spin:
+            self._frame += 1
+            frame = _BRAILLE[self._frame % len(_BRAILLE)]
+            lines.append(f"  {orange(frame)}  {smoke(self._spin)}")
+        elif self._status:
+            fn, args = self._status
+            lines.append(fn(*args))
+        return lines
+
+    def _paint(self) -> None:
+        if not _TTY:
+            return
+        new, old = self._region(), self._shown
+        out = sys.stdout.write
+
+        if len(new) == len(old):
+            at = 0                                # lines above the bottom
+            for j, line in enumerate(new):
+                if line == old[j]:
+                    continue
+                up = len(old) - j
+                out(f"\033[{up - at}A" if up > at else f"\033[{at - up}B")
+                out(f"\r\033[K{line}")
+                at = up
+            if at:
+                out(f"\033[{at}B\r")
+        else:
+            k = next((j for j, (a, b) in enumerate(zip(new, old)) if a != b),
+                     min(len(new), len(old)))
+            if len(old) > k:
+                out(f"\r\033[{len(old) - k}A")
+            out("".join(f"\r\033[K{line}\n" for line in new[k:]))
+            out("\033[J")
+
+        sys.stdout.flush()
+        self._shown = new
+
+
+_RENDER = Renderer()
+
+
+class Spinner:
+    """Context manager showing a labelled spinner on the status line."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
 
     def __enter__(self) -> "Spinner":
-        self._thread.start()
+        _RENDER.spin(self.label)
         return self
 
     def __exit__(self, *_) -> None:
-        self._stop.set()
-        self._thread.join()
-        sys.stdout.write("\r" + " " * 64 + "\r")
-        sys.stdout.flush()
+        _RENDER.clear()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  PRINT HELPERS
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _ln() -> None:          print()
-def _rule(w: int = 56):     print("  " + ghost("─" * w))
-def _print_warning(m: str): print(f"\n  {yellow('◆')}  {smoke(m)}")
-def _print_error(m: str):   print(f"\n  {red('✗')}  {m}")
+# Serialises terminal writes so parallel workers never interleave with the
+# LiveQueue cursor jumps. Re-entrant: helpers are called while it is held.
+_OUT_LOCK = threading.RLock()
+
+def _out(line: str = "") -> None:
+    """print() that keeps clear of the live region — use it for anything
+    that can run while the queue panel or a spinner is on screen."""
+    _RENDER.log(line)
+
+def _ln() -> None:          _out()
+def _rule(w: int = 56):     _out("  " + ghost("─" * w))
+
+def _print_warning(m: str) -> None:
+    _out(f"\n  {yellow('◆')}  {smoke(m)}")
+
+def _print_error(m: str) -> None:
+    _out(f"\n  {red('✗')}  {m}")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -188,7 +396,7 @@ def get_music_dir() -> Path:
     d.mkdir(parents=True, exist_ok=True)
     return d
 
-def get_archive_path() -> Path:
+def get_cache_dir() -> Path:
     """
     Platform-appropriate cache location:
       Windows → %LOCALAPPDATA%\\auditermix\\
@@ -206,7 +414,542 @@ def get_archive_path() -> Path:
 
     cache = base / "auditermix"
     cache.mkdir(parents=True, exist_ok=True)
-    return cache / "downloaded.txt"
+    return cache
+
+def get_archive_path() -> Path:
+    return get_cache_dir() / "downloaded.txt"
+
+def get_journal_path() -> Path:
+    return get_cache_dir() / "session.jsonl"
+
+def get_sync_path() -> Path:
+    return get_cache_dir() / "playlists.json"
+
+def get_library_path() -> Path:
+    return get_cache_dir() / "library.sqlite"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  DOWNLOAD ARCHIVE — loaded once per session, shared by every YoutubeDL
+# ══════════════════════════════════════════════════════════════════════════════
+
+class DownloadArchive:
+    """
+    In-memory index of downloaded.txt.
+
+    yt-dlp accepts any set-like object as "download_archive" and then skips
+    its own per-instance file read, so one instance is handed to every
+    download in the session. Lookups are O(1); new ids are appended to the
+    file immediately so an interrupted run never loses what it finished.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path  = path
+        self._lock = threading.Lock()
+        self._ids: set[str] = set()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._ids.update(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, vid_id: object) -> bool:
+        return vid_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, vid_id: str) -> None:
+        with self._lock:
+            if vid_id in self._ids:
+                return
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(vid_id + "\n")
+            self._ids.add(vid_id)
+
+
+class ArchiveView:
+    """
+    The archive as the network stage sees it while encodes run in the
+    EncodeStage. yt-dlp records a track as soon as its postprocessors
+    return, which there is the moment the file is handed off, so add() is
+    dropped here and EncodeStage adds the id once the encode has succeeded.
+    """
+
+    def __init__(self, archive: DownloadArchive) -> None:
+        self._archive = archive
+
+    def __contains__(self, vid_id: object) -> bool:
+        return vid_id in self._archive
+
+    def __len__(self) -> int:
+        return len(self._archive)
+
+    def __iter__(self):
+        return iter(self._archive)
+
+    def add(self, vid_id: str) -> None:
+        pass
+
+
+# Plain single-video YouTube URLs carry the id yt-dlp archives them under.
+_YT_ID_RE = re.compile(
+    r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|live/)|youtu\.be/)"
+    r"([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])",
+    re.IGNORECASE,
+)
+
+_YT_HOSTS = ("youtube.com", "youtu.be")
+
+def archive_key(url: str) -> str | None:
+    """Archive line for url derived offline, or None if it needs extraction."""
+    if "list=" in url:
+        return None
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return None
+    if not any(host == h or host.endswith("." + h) for h in _YT_HOSTS):
+        return None
+    m = _YT_ID_RE.search(url)
+    return f"youtube {m.group(1)}" if m else None
+
+def info_archive_id(info: dict) -> str | None:
+    """Archive line yt-dlp records for an info dict or flat playlist entry."""
+    ie_key = info.get("extractor_key") or info.get("ie_key")
+    return f"{ie_key.lower()} {info['id']}" if ie_key and info.get("id") else None
+
+def is_archived(url: str, archive: DownloadArchive | None) -> bool:
+    return archive is not None and archive_key(url) in archive
+
+def prefilter(urls: list[str], archive: DownloadArchive | None,
+              library: LibraryIndex | None = None) -> dict[int, str]:
+    """Mark queue rows already in the archive (or library) as skipped — no network."""
+    return {i: "skipped" for i, url in enumerate(urls)
+            if is_archived(url, archive) or (library is not None and url in library)}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  METADATA CACHE — extracted info dicts, persisted beside the archive
+# ══════════════════════════════════════════════════════════════════════════════
+
+CACHE_TTL       = 24 * 3600          # seconds an entry stays valid
+PLAYLIST_TTL    = 3600               # playlists grow, so trust them less
+CACHE_MAX_BYTES = 64 * 1024 * 1024   # least recently used entries go first
+_URL_MARGIN     = 5 * 60             # stream URLs this close to expiry are stale
+
+# Bulky fields nothing downstream reads — captions alone can be >1 MB per video
+_HEAVY_KEYS = {"automatic_captions", "subtitles", "heatmap", "requested_subtitles"}
+
+
+def trim_info(info: dict) -> dict:
+    """JSON-safe copy keeping what display, tagging and download need."""
+    info = sanitize_info(info)
+    trimmed = {
+        k: v for k, v in info.items()
+        if not k.startswith("__") and k not in _HEAVY_KEYS
+    }
+    if "formats" in trimmed:
+        # bestaudio/best only ever picks streams that carry audio
+        trimmed["formats"] = [
+            f for f in trimmed["formats"]
+            if f.get("acodec") != "none" and f.get("ext") != "mhtml"
+        ]
+    return trimmed
+
+
+def _cacheable(info: dict | None) -> bool:
+    return (
+        info is not None
+        and info.get("_type", "video") == "video"
+        and not info.get("is_live")
+    )
+
+
+def streams_fresh(info: dict) -> bool:
+    """True while every cached stream URL is still inside its signed expiry."""
+    deadline = time.time() + _URL_MARGIN
+    formats  = [f for f in info.get("formats") or [] if f.get("url")]
+    if not formats:
+        return False
+    for f in formats:
+        expire = parse_qs(urlparse(f["url"]).query).get("expire")
+        if not expire or not expire[0].isdigit() or int(expire[0]) < deadline:
+            return False
+    return True
+
+
+class MetadataCache:
+    """
+    SQLite-backed store of trimmed info dicts keyed by archive id or URL.
+
+    Entries older than ttl are dropped on read; once the payload total
+    passes max_bytes the least recently read entries are evicted. Cached
+    dicts carry "__cached_at" so callers can tell them from fresh ones.
+    """
+
+    def __init__(self, path: Path, ttl: int = CACHE_TTL,
+                 max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.ttl       = ttl
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._db       = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS info ("
+            " key TEXT PRIMARY KEY, stored REAL, used REAL,"
+            " size INTEGER, data TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS info_used ON info(used)")
+        self._db.commit()
+        self._total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM info"
+        ).fetchone()[0]
+
+    @staticmethod
+    def key(url: str) -> str:
+        return archive_key(url) or url
+
+    def get(self, url: str, ttl: int | None = None) -> dict | None:
+        key = self.key(url)
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            row = self._db.execute(
+                "SELECT stored, size, data FROM info WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            stored, size, data = row
+            if stored + ttl < now:
+                self._db.execute("DELETE FROM info WHERE key = ?", (key,))
+                self._total -= size
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE info SET used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        info = json.loads(data)
+        info["__cached_at"] = stored
+        return info
+
+    def put(self, url: str, info: dict) -> None:
+        data = json.dumps(trim_info(info), separators=(",", ":"))
+        key  = self.key(url)
+        now  = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT size FROM info WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO info VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(data), data),
+            )
+            self._total += len(data) - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM info ORDER BY used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM info WHERE key = ?", (row[0],))
+            self._total -= row[1]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  LIBRARY INDEX — what is already in ~/Music, whatever the archive says
+#  One row per audio file with its size, mtime and the source URL and title
+#  embedded in its tags. A refresh stats every file but only reads the tags
+#  of files that are new or changed, so its cost follows the changes.
+# ══════════════════════════════════════════════════════════════════════════════
+
+_SOURCE_TAGS = ("purl", "comment")      # where FFmpegMetadata puts webpage_url
+
+
+def _read_tags(path: Path) -> dict[str, str]:
+    """Tags of one audio file through ffmpeg's ffmetadata muxer ({} if unreadable)."""
+    cmd = ["ffmpeg", "-v", "error", "-i", str(path)]
+    if path.suffix == ".opus":
+        cmd += ["-map_metadata", "0:s:a:0"]       # Ogg keeps tags on the stream
+    try:
+        out = subprocess.run(cmd + ["-f", "ffmetadata", "-"], capture_output=True,
+                             stdin=subprocess.DEVNULL,
+                             check=True).stdout.decode("utf-8", "replace")
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    tags: dict[str, str] = {}
+    for entry in re.split(r"(?<!\\)\n", out):
+        if entry.startswith("["):
+            break                                 # chapters follow the globals
+        m = re.match(r"((?:[^=\\]|\\.)+)=(.*)", entry, re.S)
+        if m and not entry.startswith(";"):
+            key, value = (re.sub(r"\\(.)", r"\1", g, flags=re.S) for g in m.groups())
+            tags.setdefault(key.lower(), value)
+    return tags
+
+
+def _audio_files(root: Path) -> Iterator[tuple[str, os.stat_result]]:
+    """(path relative to root, stat) for every file in a codec we write."""
+    exts  = {f".{c}" for c in CODECS}
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif os.path.splitext(entry.name)[1].lower() in exts:
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    yield os.path.relpath(entry.path, root), st
+
+
+class LibraryIndex:
+    """
+    SQLite index of the audio files under root, kept beside the archive.
+
+    refresh() brings it up to date; after that `url in library` is true when
+    a file tagged with url's source exists in codec, and archive_ids() lists
+    the archive line of every tagged file for --rebuild-archive.
+    """
+
+    def __init__(self, path: Path, root: Path, codec: str) -> None:
+        self.root  = root
+        self.codec = codec
+        self._db   = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER,"
+            " source TEXT, title TEXT)"
+        )
+        self._db.commit()
+        self._have: set[str] = set()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return archive_key(url) or url
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and self.key(url) in self._have
+
+    def refresh(self) -> tuple[int, int]:
+        """Re-read changed files, forget deleted ones; returns (read, dropped)."""
+        known = {path: (mtime, size) for path, mtime, size in
+                 self._db.execute("SELECT path, mtime, size FROM files")}
+        seen:  set[str] = set()
+        stale: list[tuple[str, int, int]] = []
+        for rel, st in _audio_files(self.root):
+            seen.add(rel)
+            if known.get(rel) != (st.st_mtime_ns, st.st_size):
+                stale.append((rel, st.st_mtime_ns, st.st_size))
+        gone = known.keys() - seen
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+                tags = pool.map(_read_tags, (self.root / rel for rel, _, _ in stale))
+                rows = []
+                for (rel, mtime, size), t in zip(stale, tags):
+                    source = next((t[k] for k in _SOURCE_TAGS
+                                   if t.get(k, "").startswith(("http://", "https://"))), None)
+                    rows.append((rel, mtime, size, source, t.get("title")))
+                self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows)
+        self._db.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in gone))
+        self._db.commit()
+
+        self._have = {
+            self.key(source)
+            for path, source in self._db.execute(
+                "SELECT path, source FROM files WHERE source IS NOT NULL")
+            if path.lower().endswith(f".{self.codec}")
+        }
+        return len(stale), len(gone)
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def archive_ids(self) -> Iterator[str | None]:
+        """Archive line for every tagged file; None where no extractor claims it."""
+        ies = None
+        for (source,) in self._db.execute("SELECT source FROM files WHERE source IS NOT NULL"):
+            key = archive_key(source)
+            if key is None:
+                if ies is None:
+                    _yt_dlp()
+                    from yt_dlp.extractor import gen_extractor_classes
+                    ies = gen_extractor_classes()
+                ie  = next((ie for ie in ies if ie.suitable(source)), None)
+                vid = ie.get_temp_id(source) if ie is not None else None
+                key = f"{ie.ie_key().lower()} {vid}" if vid else None
+            yield key
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  ARTWORK CACHE — each distinct cover fetched and converted once
+#  Album and playlist tracks usually share their artwork; instead of every
+#  track downloading its thumbnail and spawning ffmpeg to convert it, the
+#  converted jpg is kept under the cache dir and copied in before download.
+# ══════════════════════════════════════════════════════════════════════════════
+
+ARTWORK_PX        = 600                  # longest side of embedded covers
+ARTWORK_MAX_BYTES = 256 * 1024 * 1024    # least recently used files go first
+
+
+class ArtworkCache:
+    """
+    Converted covers under root, one file per source URL and one per image
+    content. A URL seen before costs a file copy; a new URL serving bytes
+    already converted costs one fetch and no ffmpeg. Files are named with
+    max_px, so changing --artwork-size never reuses a differently sized one.
+    """
+
+    def __init__(self, root: Path, max_px: int = ARTWORK_PX,
+                 max_bytes: int = ARTWORK_MAX_BYTES) -> None:
+        self.root   = root
+        self.max_px = max_px
+        self._lock  = threading.Lock()
+        self._busy: dict[str, threading.Lock] = {}   # one fetch per URL at a time
+        self._missing: set[str] = set()              # URLs that failed this session
+        root.mkdir(parents=True, exist_ok=True)
+        self._prune(max_bytes)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.root / f"{digest}-{self.max_px}.jpg"
+
+    def get(self, url: str, fetch: Callable[[str], bytes]) -> Path:
+        """Cached jpg for url; fetch(url) returns the source image bytes."""
+        path = self._path("url " + url)
+        with self._lock:
+            busy = self._busy.setdefault(url, threading.Lock())
+        with busy:
+            if path.exists():
+                os.utime(path)
+                return path
+            data    = fetch(url)
+            content = self._path("sha256 " + hashlib.sha256(data).hexdigest())
+            if not content.exists():
+                self._convert(data, content)
+            try:
+                os.link(content, path)
+            except OSError:
+                shutil.copyfile(content, path)
+        return path
+
+    def cover(self, ydl: YoutubeDL, info: dict) -> Path | None:
+        """
+        Cached jpg of info's best thumbnail that can be fetched, through ydl;
+        None if it has none. Like yt-dlp's own writethumbnail, thumbnails
+        are tried best first and one that fails (YouTube's guessed
+        maxresdefault often 404s) falls through to the next.
+        """
+        from yt_dlp.networking import Request
+        from yt_dlp.networking.exceptions import RequestError
+
+        error: Exception | None = None
+        for thumb in reversed(info.get("thumbnails") or []):   # yt-dlp sorts worst → best
+            url = thumb.get("url")
+            if not url or url in self._missing:
+                continue
+
+            def fetch(url: str, headers: dict = thumb.get("http_headers") or {}) -> bytes:
+                with ydl.urlopen(Request(url, headers=headers)) as resp:
+                    return resp.read()
+
+            try:
+                return self.get(url, fetch)
+            except (RequestError, RuntimeError) as exc:
+                self._missing.add(url)
+                error = exc
+        if error is not None:
+            raise error
+        return None
+
+    def _convert(self, data: bytes, dest: Path) -> None:
+        """One ffmpeg: any image format in, jpg no larger than max_px out."""
+        # unique names: two URLs serving the same image convert to one dest
+        with tempfile.NamedTemporaryFile(dir=self.root, suffix=".src", delete=False) as f:
+            f.write(data)
+        src = Path(f.name)
+        tmp = src.with_suffix(".tmp.jpg")
+        vf  = "format=yuvj420p"
+        if self.max_px:
+            n  = self.max_px
+            vf = f"scale='min({n},iw)':'min({n},ih)':force_original_aspect_ratio=decrease,{vf}"
+        try:
+            subprocess.run(
+                ["ffmpeg", "-v", "error", "-y", "-i", str(src),
+                 "-vf", vf, "-frames:v", "1", "-q:v", "2", str(tmp)],
+                check=True, capture_output=True, stdin=subprocess.DEVNULL,
+            )
+            os.replace(tmp, dest)
+        except subprocess.CalledProcessError as exc:
+            err = exc.stderr.decode(errors="replace").strip().splitlines()
+            raise RuntimeError(f"cannot convert artwork — {err[-1] if err else exc}") from None
+        finally:
+            src.unlink(missing_ok=True)
+            tmp.unlink(missing_ok=True)
+
+    def _prune(self, max_bytes: int) -> None:
+        # URL entries are usually hard links to a content entry: count each
+        # inode once and only free its bytes when its last name goes
+        files = [(f.stat(), f) for f in self.root.glob("*.jpg")]
+        names: dict[tuple[int, int], int] = {}        # inode → names left
+        sizes: dict[tuple[int, int], int] = {}
+        for st, _ in files:
+            inode = (st.st_dev, st.st_ino)
+            names[inode] = names.get(inode, 0) + 1
+            sizes[inode] = st.st_size
+        total = sum(sizes.values())
+        for st, f in sorted(files, key=lambda x: x[0].st_mtime):
+            if total <= max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            inode = (st.st_dev, st.st_ino)
+            names[inode] -= 1
+            if not names[inode]:
+                total -= st.st_size
+
+
+def artwork_pp(cache: ArtworkCache):
+    """
+    before_dl postprocessor standing in for writethumbnail + the jpg
+    conversion: puts the cached cover beside the audio file and points the
+    best thumbnail at it, where EmbedThumbnail picks it up (and deletes it).
+    """
+    from yt_dlp.postprocessor import PostProcessor
+
+    class _ArtworkPP(PostProcessor):
+        def run(self, info: dict):
+            try:
+                src = cache.cover(self._downloader, info)
+                if src is None:
+                    return [], info
+                dest = Path(info["_filename"]).with_suffix(".jpg")
+                shutil.copyfile(src, dest)
+            except Exception as exc:
+                self.report_warning(f"artwork unavailable — {exc}")
+                return [], info
+            info["thumbnails"][-1]["filepath"] = str(dest)
+            return [], info
+
+    return _ArtworkPP()
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -215,11 +958,26 @@ def get_archive_path() -> Path:
 
 CODECS: list[str] = ["m4a", "mp3", "opus", "flac"]
 
+MAX_JOBS      = 16
+MAX_FRAGMENTS = 16
+PREFETCH      = 2       # rows resolved ahead of the workers by default
+
 DEFAULTS: dict = {
     "codec":     "m4a",
     "quality":   "192",
     "thumbnail": True,
     "archive":   True,
+    "jobs":      1,
+    "encoders":  os.cpu_count() or 1,   # 0 = post-process inline
+    "cache":     True,
+    "fragments": "auto",                # or a fixed count, 1 – MAX_FRAGMENTS
+    "link":      None,                  # link capacity in Mbit/s, if known
+    "report":    None,                  # JSON Lines timing report path
+    "artwork":   ARTWORK_PX,            # max cover size in px, 0 = as published
+    "stream":    False,                 # pipe downloads straight into ffmpeg
+    "prefetch":  PREFETCH,              # rows resolved ahead, 0 = off
+    "sync":      False,                 # only queue playlist entries added since last run
+    "library":   False,                 # skip sources already in the music dir
 }
 
 def _codec_row(cfg: dict) -> str:
@@ -231,15 +989,20 @@ def _codec_row(cfg: dict) -> str:
 def _bool_fmt(val: bool) -> str:
     return green("on") if val else smoke("off")
 
+def _fragments_fmt(val: int | str) -> str:
+    return "auto  · adapts to throughput" if val == "auto" else f"{val} concurrent"
+
 def print_settings(cfg: dict) -> None:
     _ln()
     print(f"  {ghost('◆')}  {white('settings')}")
     _ln()
     print(f"  {'codec':<14}{_codec_row(cfg)}")
-    print(f"  {'quality':<14}{smoke(cfg['quality'] + ' kbps')}")
+    print(f"  {'quality':<14}{smoke(cfg['quality'] + ' kbps')}  {ghost('when re-encoding')}")
     print(f"  {'save to':<14}{smoke(str(get_music_dir()))}")
     print(f"  {'thumbnail':<14}{_bool_fmt(cfg['thumbnail'])}")
     print(f"  {'skip dupes':<14}{_bool_fmt(cfg['archive'])}")
+    print(f"  {'jobs':<14}{smoke(str(cfg['jobs']) + ' parallel')}")
+    print(f"  {'fragments':<14}{smoke(_fragments_fmt(cfg['fragments']))}")
     _ln()
     _rule()
     _ln()
@@ -254,7 +1017,7 @@ def ask_settings(cfg: dict) -> dict:
     cfg = dict(cfg)
     print_settings(cfg)
     print(f"  {smoke('type a setting name to change it, or press')} {white('enter')} {smoke('to start')}")
-    print(f"  {ghost('  codec  ·  quality  ·  thumbnail  ·  dupes  ·  reset')}")
+    print(f"  {ghost('  codec  ·  quality  ·  thumbnail  ·  dupes  ·  jobs  ·  fragments  ·  reset')}")
     _ln()
 
     while True:
@@ -302,11 +1065,34 @@ def ask_settings(cfg: dict) -> dict:
             else:
                 changed = False
 
+        elif key in ("jobs", "j"):
+            raw = input(
+                f"  {smoke('parallel downloads')} {ghost(f'[1 – {MAX_JOBS}]')} {ghost('›')} "
+            ).strip()
+            if raw.isdigit() and 1 <= int(raw) <= MAX_JOBS:
+                cfg["jobs"] = int(raw)
+            else:
+                print(f"  {ghost('invalid job count — unchanged')}")
+                changed = False
+
+        elif key in ("fragments", "f"):
+            raw = input(
+                f"  {smoke('concurrent fragments')} "
+                f"{ghost(f'[1 – {MAX_FRAGMENTS} / auto]')} {ghost('›')} "
+            ).strip().lower()
+            if raw == "auto":
+                cfg["fragments"] = "auto"
+            elif raw.isdigit() and 1 <= int(raw) <= MAX_FRAGMENTS:
+                cfg["fragments"] = int(raw)
+            else:
+                print(f"  {ghost('invalid fragment count — unchanged')}")
+                changed = False
+
         elif key in ("reset", "defaults"):
             cfg = dict(DEFAULTS)
 
         else:
-            print(f"  {ghost('unknown — try: codec / quality / thumbnail / dupes / reset')}")
+            print(f"  {ghost('unknown — try: codec / quality / thumbnail / dupes / jobs / fragments / reset')}")
             changed = False
 
         if changed:
@@ -357,73 +1143,82 @@ def collect_urls() -> list[str]:
     return urls
 
 
+def iter_urls(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yield URLs from an open file (or stdin), one per line.
+    Blank lines and # comments are ignored; anything else that is not a
+    URL is reported and skipped.
+    """
+    for n, line in enumerate(lines, 1):
+        raw = line.strip()
+        if not raw or raw.startswith("#"):
+            continue
+        if not _URL_RE.match(raw):
+            _print_warning(f"line {n}: not a valid url — skipped")
+            continue
+        yield raw
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  QUEUE DISPLAY
 # ══════════════════════════════════════════════════════════════════════════════
 
 # ══════════════════════════════════════════════════════════════════════════════
-#  LIVE QUEUE — in-place updating queue panel
-#  Uses ANSI cursor-up to overwrite rows instead of re-printing below.
+#  LIVE QUEUE — the dashboard panel in the Renderer's live region
+#  Queue rows, one progress line per busy worker and an aggregate line.
 #  Falls back to plain printing on non-TTY output (piped / redirected).
 # ══════════════════════════════════════════════════════════════════════════════
 
 _ICONS: dict[str, str] = {
-    "pending": smoke("○"),
-    "active":  orange("◆"),
-    "done":    green("✓"),
-    "skipped": smoke("◇"),
-    "drm":     red("⊘"),
-    "error":   red("✗"),
+    "pending":  smoke("○"),
+    "active":   orange("◆"),
+    "encoding": yellow("◈"),
+    "done":     green("✓"),
+    "skipped":  smoke("◇"),
+    "drm":      red("⊘"),
+    "error":    red("✗"),
 }
 
 _NOTES: dict[str, str] = {
-    "skipped": smoke("  already in library"),
-    "drm":     red("  DRM protected"),
-    "error":   smoke("  failed"),
+    "encoding": smoke("  encoding"),
+    "skipped":  smoke("  already in library"),
+    "drm":      red("  DRM protected"),
+    "error":    smoke("  failed"),
 }
 
 
-class _NLCounter:
-    """Thin sys.stdout wrapper that counts newlines written below the queue."""
-
-    def __init__(self):
-        self._orig  = sys.stdout
-        self.count  = 0
-
-    def write(self, s: str) -> int:
-        self.count += s.count("\n")
-        return self._orig.write(s)
-
-    def flush(self):            return self._orig.flush()
-    def isatty(self) -> bool:   return self._orig.isatty()
-    def fileno(self) -> int:    return self._orig.fileno()
-    def __getattr__(self, n):   return getattr(self._orig, n)
+_FINAL = {"done", "skipped", "drm", "error"}
+WORKER_W = 26              # label width on a worker line
 
 
 class LiveQueue:
     """
-    Renders a queue list once, then updates icons in-place after each track.
+    Dashboard panel: drawn into the Renderer's live region, so it stays at
+    the bottom of the terminal while track output scrolls above it.
 
     Usage:
-        q = LiveQueue(urls)
-        q.draw(states)          # initial render
-        ...download track 0...
-        q.update(states)        # jumps cursor back up and redraws
-        ...download track 1...
-        q.update(states)
+        q = LiveQueue(labels)
+        q.draw(states)          # attach to the renderer
+        ...worker thread: q.bind(i), progress dicts via q.progress(d)...
+        q.update(states)        # queued for the next render frame
+        q.restore()             # final frame, left behind as plain output
+
+    Queues taller than the terminal show a window that follows the first
+    unfinished row. Safe to drive from several worker threads.
     """
 
-    def __init__(self, urls: list[str]) -> None:
-        self.urls       = urls
-        self._height    = 0          # lines in the queue block
-        self._counter   = _NLCounter()
-        self._has_drawn = False
+    def __init__(self, labels: list[str]) -> None:
+        self.labels   = labels
+        self._states: dict[int, str] = {}
+        self._first   = 0            # first row not yet finished
+        # worker thread id → [row, latest progress dict or None]
+        self._workers: dict[int, list] = {}
 
     def _row(self, i: int, states: dict[int, str]) -> str:
         state = states.get(i, "pending")
         icon  = _ICONS[state]
-        url   = self.urls[i]
-        label = url if len(url) <= 54 else url[:51] + "…"
+        label = self.labels[i]
+        label = label if len(label) <= 54 else label[:51] + "…"
         note  = _NOTES.get(state, "")
         text  = (
             white(label)  if state == "active" else
@@ -432,50 +1227,199 @@ class LiveQueue:
         )
         return f"  {icon}  {text}{note}"
 
+    def _worker_line(self, row: int, d: dict | None) -> str:
+        label = (d or {}).get("info_dict", {}).get("title") or self.labels[row]
+        label = label if len(label) <= WORKER_W else label[:WORKER_W - 1] + "…"
+        head  = f"  {orange('⇣')}  {white(f'{label:<{WORKER_W}}')}"
+        if d is None:
+            return f"{head}  {ghost('resolving')}"
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        speed = d.get("speed")
+        eta   = d.get("eta")
+        pct   = d.get("downloaded_bytes", 0) * 100 / total if total else 0.0
+        spd   = f"{speed / 1024 / 1024:.1f} MB/s" if speed else "··· MB/s"
+        eta_s = f"eta {eta}s" if eta is not None else "eta ?s"
+        return (
+            f"{head}  {_bar(pct, 12)} {orange(f'{pct:5.1f}%')}"
+            f"  {smoke(spd)}  {ghost(eta_s)}"
+        )
+
+    def lines(self) -> list[str]:
+        states  = self._states
+        n       = len(self.labels)
+        workers = [
+            (row, d) for row, d in list(self._workers.values())
+            if states.get(row) == "active"
+        ]
+        while self._first < n and states.get(self._first) in _FINAL:
+            self._first += 1
+
+        # Keep the panel to about half the screen; track output scrolls above
+        half = shutil.get_terminal_size().lines // 2
+        size = min(n, max(half - len(workers) - 4, 3))
+        top  = max(0, min(self._first, n - size))
+        rows = range(top, top + size)
+
+        lines = [""] + [self._row(i, states) for i in rows]
+        if size < n:
+            lines.append(
+                f"  {ghost(f'⋯  {top} above  ·  {n - rows.stop} below  ·  {n} total')}"
+            )
+        if workers:
+            lines.append("")
+            lines += [self._worker_line(row, d) for row, d in sorted(workers)]
+            speed   = sum((d or {}).get("speed") or 0 for _, d in workers)
+            settled = sum(1 for st in states.values() if st in _FINAL)
+            summary = (f"{speed / 1024 / 1024:.1f} MB/s total  ·  "
+                       f"{len(workers)} active  ·  {settled}/{n} settled")
+            lines.append(f"  {ghost(summary)}")
+        return lines + [""]
+
     def draw(self, states: dict[int, str]) -> None:
         """Initial draw — call once before the download loop."""
-        lines = [""] + [self._row(i, states) for i in range(len(self.urls))] + [""]
-        for line in lines:
-            print(line)
-        self._height    = len(lines)
-        self._has_drawn = True
-
-        # Install the newline counter AFTER printing the queue
+        self._states = states
         if _TTY:
-            sys.stdout = self._counter
-            self._counter.count = 0
+            _RENDER.attach(self)
+        else:
+            rows = [self._row(i, states) for i in range(len(self.labels))]
+            for line in [""] + rows + [""]:
+                print(line)
 
     def update(self, states: dict[int, str]) -> None:
-        """Move cursor up, redraw queue rows in-place, move back down."""
-        if not _TTY or not self._has_drawn:
-            # Non-TTY or not yet drawn — just skip (don't spam)
-            return
+        """Schedule a redraw; the Renderer coalesces bursts of updates."""
+        self._states = states
+        _RENDER.redraw()
 
-        lines_below = self._counter.count
-        total_up    = lines_below + self._height
+    def bind(self, row: int) -> None:
+        """The calling worker thread is now downloading row."""
+        self._workers[threading.get_ident()] = [row, None]
+        _RENDER.redraw()
 
-        # Restore real stdout for the cursor escape writes
-        sys.stdout = self._counter._orig
+    def progress(self, d: dict) -> None:
+        worker = self._workers.get(threading.get_ident())
+        if worker is not None:
+            worker[1] = d
+            _RENDER.redraw()
 
-        if total_up > 0:
-            sys.stdout.write(f"\033[{total_up}A")   # move cursor up
+    def restore(self) -> None:
+        """Draw the final frame and detach from the renderer."""
+        _RENDER.detach(self)
 
-        rows = [""] + [self._row(i, states) for i in range(len(self.urls))] + [""]
-        for row in rows:
-            sys.stdout.write(f"\r\033[K{row}\n")    # clear line, write new content
 
-        if lines_below > 0:
-            sys.stdout.write(f"\033[{lines_below}B")   # move back down
-        sys.stdout.flush()
+# ══════════════════════════════════════════════════════════════════════════════
+#  RUN METRICS — per-track timings for --report
+#  Opt-in: without --report the session has no Metrics and every hook skips
+#  the bookkeeping after a single None check.
+# ══════════════════════════════════════════════════════════════════════════════
 
-        # Re-install counter (reset count to lines_below — we're back at same pos)
-        self._counter.count = lines_below
-        sys.stdout = self._counter
+class TrackTiming:
+    """Where one row's time went. Filled in by whichever thread runs it."""
+
+    __slots__ = ("row", "url", "title", "state", "extract_s", "ttfb_s",
+                 "download_s", "bytes", "stages", "disk_bytes", "_t0", "_dl0")
+
+    def __init__(self, row: int, url: str) -> None:
+        self.row        = row
+        self.url        = url
+        self.title      = ""
+        self.state      = ""
+        self.extract_s: float | None = None
+        self.ttfb_s:    float | None = None
+        self.download_s = 0.0
+        self.bytes      = 0
+        self.stages: dict[str, float] = {}    # postprocessor key → seconds
+        self.disk_bytes: int | None = None
+        self._t0  = time.perf_counter()
+        self._dl0 = 0.0
+
+    def download_started(self) -> None:
+        self._dl0 = time.perf_counter()
+
+    def progress(self, d: dict) -> None:
+        if d["status"] == "downloading":
+            if self.ttfb_s is None and d.get("downloaded_bytes"):
+                self.ttfb_s = time.perf_counter() - self._dl0
+        elif d["status"] == "finished":
+            self.download_s = time.perf_counter() - self._dl0
+            self.bytes += d.get("total_bytes") or d.get("downloaded_bytes") or 0
+
+    def stage(self, key: str, seconds: float) -> None:
+        self.stages[key] = self.stages.get(key, 0.0) + seconds
+
+    def output(self, filepath: str | None) -> None:
+        if filepath and os.path.exists(filepath):
+            self.disk_bytes = os.path.getsize(filepath)
+
+    def as_dict(self) -> dict:
+        return {
+            "row":        self.row,
+            "url":        self.url,
+            "title":      self.title,
+            "state":      self.state,
+            "extract_s":  self.extract_s,
+            "ttfb_s":     self.ttfb_s,
+            "download_s": self.download_s or None,
+            "bytes":      self.bytes or None,
+            "stages":     self.stages,
+            "disk_bytes": self.disk_bytes,
+            "total_s":    time.perf_counter() - self._t0,
+        }
+
+
+class Metrics:
+    """
+    Collects a TrackTiming per row and appends one JSON line per settled
+    row to the report file.
 
-    def restore(self) -> None:
-        """Restore real stdout after the download loop ends."""
-        if _TTY and sys.stdout is self._counter:
-            sys.stdout = self._counter._orig
+    Usage:
+        timing = metrics.begin(row, url)     # handed to download_one
+        ...
+        metrics.finish(row, state)           # writes the line
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._run  = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._open: dict[int, TrackTiming] = {}
+        self.records: list[dict] = []
+
+    def begin(self, row: int, url: str) -> TrackTiming:
+        timing = TrackTiming(row, url)
+        with self._lock:
+            self._open[row] = timing
+        return timing
+
+    def encoded(self, row: int, result: dict) -> None:
+        """Merge what an encode worker measured (see _encode_track)."""
+        with self._lock:
+            timing = self._open.get(row)
+        if timing is not None:
+            for key, seconds in result["stages"].items():
+                timing.stage(key, seconds)
+            timing.output(result["filepath"])
+
+    def finish(self, row: int, state: str) -> None:
+        with self._lock:
+            timing = self._open.pop(row, None)
+            if timing is None:
+                return
+            timing.state = state
+            record = {"run": self._run, **timing.as_dict()}
+            self.records.append(record)
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _percentile(values: list[float], p: int) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * p / 100) - 1)]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -484,59 +1428,262 @@ class LiveQueue:
 
 BAR_W = 28
 
-def _bar(pct: float) -> str:
-    n = max(0, min(BAR_W, int(BAR_W * pct / 100)))
-    return ghost("▕") + orange("█" * n) + ghost("░" * (BAR_W - n)) + ghost("▏")
+def _bar(pct: float, width: int = BAR_W) -> str:
+    n = max(0, min(width, int(width * pct / 100)))
+    return ghost("▕") + orange("█" * n) + ghost("░" * (width - n)) + ghost("▏")
 
 def _bar_full() -> str:
     return ghost("▕") + orange("█" * BAR_W) + ghost("▏")
 
-def make_progress_hook():
+def _progress_line(d: dict) -> str:
+    total      = d.get("total_bytes") or d.get("total_bytes_estimate")
+    downloaded = d.get("downloaded_bytes", 0)
+    speed      = d.get("speed")
+    eta        = d.get("eta")
+
+    spd   = f"{speed / 1024 / 1024:.1f} MB/s" if speed else "··· MB/s"
+    eta_s = f"eta {eta}s" if eta is not None else "eta ?s"
+
+    if total:
+        pct = downloaded * 100 / total
+        return f"  {_bar(pct)} {orange(f'{pct:5.1f}%')}  {smoke(spd)}  {ghost(eta_s)}"
+    mb = downloaded / 1024 / 1024
+    return (
+        f"  {ghost('▕' + '░' * BAR_W + '▏')}"
+        f"  {smoke(f'{mb:.1f} MB')}  {smoke(spd)}"
+    )
+
+# Set on Ctrl+C so in-flight parallel downloads abort at their next callback.
+_CANCEL = threading.Event()
+
+def make_progress_hook(live: bool = True, panel: "LiveQueue | None" = None):
+    """
+    With a panel every worker's progress goes to its dashboard line; live
+    additionally logs the finished bar (and, without a panel, shows the
+    running one on the status line).
+    """
     def hook(d: dict) -> None:
+        if _CANCEL.is_set():
+            raise KeyboardInterrupt
+
         status = d["status"]
+        if panel is not None and status != "error":
+            panel.progress(d)
+        if not live:
+            return
 
         if status == "downloading":
-            total      = d.get("total_bytes") or d.get("total_bytes_estimate")
-            downloaded = d.get("downloaded_bytes", 0)
-            speed      = d.get("speed")
-            eta        = d.get("eta")
-
-            spd   = f"{speed / 1024 / 1024:.1f} MB/s" if speed else "··· MB/s"
-            eta_s = f"eta {eta}s" if eta is not None else "eta ?s"
-
-            if total:
-                pct  = downloaded * 100 / total
-                line = (
-                    f"\r  {_bar(pct)} {orange(f'{pct:5.1f}%')}"
-                    f"  {smoke(spd)}  {ghost(eta_s)}   "
-                )
-            else:
-                mb   = downloaded / 1024 / 1024
-                line = (
-                    f"\r  {ghost('▕' + '░' * BAR_W + '▏')}"
-                    f"  {smoke(f'{mb:.1f} MB')}  {smoke(spd)}   "
-                )
-            sys.stdout.write(line)
-            sys.stdout.flush()
-
+            if panel is None:
+                _RENDER.status(_progress_line, d)   # formatted once per frame
         elif status == "finished":
-            sys.stdout.write(
-                f"\r  {_bar_full()} {orange('100.0%')}   \n"
-            )
-            sys.stdout.flush()
-
+            _RENDER.commit(f"  {_bar_full()} {orange('100.0%')}")
         elif status == "error":
-            sys.stdout.write(f"\n  {red('✗')}  fragment error — retrying\n")
-            sys.stdout.flush()
+            _RENDER.commit(f"  {red('✗')}  fragment error — retrying")
 
     return hook
 
 
+# Friendly names for the postprocessor_hooks stage display; keys not listed
+# here are shown as-is, the ones in _PP_SILENT not at all.
+# (yt-dlp reports pp_key(), which drops the "FFmpeg" prefix.)
+_PP_LABELS = {
+    "Metadata":            "writing tags",
+    "ExtractAudio":        "extracting audio",
+    "ThumbnailsConvertor": "converting artwork",
+    "EmbedThumbnail":      "embedding artwork",
+    "_Artwork":            "artwork",
+    "_Audio":              "audio + tags + artwork",
+}
+_PP_SILENT = {"MoveFiles", "_Handoff"}
+
+
+class _StageClock:
+    """
+    Start times of the running postprocessors, innermost last. One that runs
+    others through run_pp (_Audio falling back to the chain) only wraps
+    them: finish() returns None for it, so their time is not counted twice.
+    """
+
+    def __init__(self) -> None:
+        self._running: list[list] = []      # [key, start, wraps others]
+
+    def start(self, key: str) -> None:
+        if self._running:
+            self._running[-1][2] = True
+        self._running.append([key, time.perf_counter(), False])
+
+    def finish(self, key: str) -> float | None:
+        while self._running:                # entries above key belong to a raise
+            running, started, wraps = self._running.pop()
+            if running == key:
+                return None if wraps else time.perf_counter() - started
+        return None
+
+    def clear(self) -> None:
+        self._running.clear()
+
+
+class StageHook:
+    """
+    postprocessor_hooks callback: a spinner named after the running
+    postprocessor, replaced by a "label  1.2s" line once it finishes.
+    A postprocessor that wraps others gets no line of its own — theirs
+    already cover it. stop() clears whatever one that raised left behind.
+    """
+
+    def __init__(self, live: bool = True,
+                 timing: TrackTiming | None = None) -> None:
+        self.live     = live
+        self.timing   = timing
+        self._spinner: Spinner | None = None
+        self._clock   = _StageClock()
+
+    def __call__(self, d: dict) -> None:
+        if _CANCEL.is_set():
+            raise KeyboardInterrupt
+        key = d.get("postprocessor", "")
+        if key in _PP_SILENT:
+            if self.timing is not None and key == "MoveFiles" and d["status"] == "finished":
+                self.timing.output(d["info_dict"].get("filepath"))
+            return
+        if not self.live and self.timing is None:
+            return
+
+        label = _PP_LABELS.get(key, key)
+        if d["status"] == "started":
+            self._stop_spinner()
+            self._clock.start(key)
+            if self.live:
+                self._spinner = Spinner(label).__enter__()
+        elif d["status"] == "finished":
+            self._stop_spinner()
+            elapsed = self._clock.finish(key)
+            if elapsed is None:
+                return
+            if self.timing is not None:
+                self.timing.stage(key, elapsed)
+            if self.live:
+                _out(f"  {yellow('◈')}  {smoke(label):<30}{ghost(f'{elapsed:.1f}s')}")
+
+    def stop(self) -> None:
+        self._stop_spinner()
+        self._clock.clear()
+
+    def _stop_spinner(self) -> None:
+        if self._spinner:
+            self._spinner.__exit__()
+            self._spinner = None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  FRAGMENT TUNING — concurrent DASH/HLS fragments and HTTP chunk size
+# ══════════════════════════════════════════════════════════════════════════════
+
+_CHUNK_START = 10 << 20    # yt-dlp's own YouTube default
+_CHUNK_MIN   = 1 << 20
+_CHUNK_MAX   = 64 << 20
+_SLOW_RATIO  = 0.6         # a track below this share of capacity counts as slow
+
+
+class FragmentTuner:
+    """
+    Per-worker fragment concurrency and HTTP chunk size.
+
+    With a fixed fragment count from the settings it just applies it. In
+    auto mode it starts at one fragment and, after each track, looks at the
+    speeds reported to the progress hook: a fragment error halves both
+    knobs, a track that ran below _SLOW_RATIO of capacity adds one fragment
+    and doubles the chunk size. Capacity is --link split across the workers,
+    or the best speed this worker has reached so far. A format that brings
+    its own chunk size (YouTube's 10 MiB ranges) caps the chunk there; once
+    the chunk grows back to it, the format's own setting applies again.
+    """
+
+    def __init__(self, cfg: dict) -> None:
+        self.adaptive  = cfg["fragments"] == "auto"
+        self.fragments = 1 if self.adaptive else int(cfg["fragments"])
+        self.chunk: int | None = None      # None = extractor default
+        self._capacity = (cfg["link"] * 125_000 / cfg["jobs"]) if cfg["link"] else 0.0
+        self._fixed_capacity = bool(cfg["link"])
+        self._reset()
+
+    def _reset(self) -> None:
+        self._speeds: list[float] = []
+        self._errors     = 0
+        self._fragmented = False
+        self._format_chunk: int | None = None
+
+    def apply(self, params: dict) -> None:
+        """Settle the previous track's measurements, then set the knobs."""
+        self._settle()
+        params["concurrent_fragment_downloads"] = self.fragments
+        if self.chunk is None:
+            params.pop("http_chunk_size", None)
+        else:
+            params["http_chunk_size"] = self.chunk
+
+    def observe(self, d: dict) -> None:
+        if d["status"] == "downloading":
+            if d.get("speed"):
+                self._speeds.append(d["speed"])
+            if d.get("fragment_count") is not None:
+                self._fragmented = True
+            opts = (d.get("info_dict") or {}).get("downloader_options") or {}
+            self._format_chunk = opts.get("http_chunk_size")
+        elif d["status"] == "error":
+            self._errors += 1
+
+    def fragment_retry(self) -> None:
+        self._errors += 1
+
+    def _settle(self) -> None:
+        if not self.adaptive or not self._speeds:
+            self._reset()
+            return
+
+        speed = sum(self._speeds) / len(self._speeds)
+        own   = self._format_chunk
+        chunk = self.chunk or own or _CHUNK_START
+        if self._errors:
+            self.fragments = max(1, self.fragments // 2)
+            self.chunk     = max(_CHUNK_MIN, chunk // 2)
+        elif self._capacity and speed < self._capacity * _SLOW_RATIO:
+            if self._fragmented:
+                self.fragments = min(MAX_FRAGMENTS, self.fragments + 1)
+            else:
+                self.chunk = min(own or _CHUNK_MAX, chunk * 2)
+        if own and self.chunk is not None and self.chunk >= own:
+            self.chunk = None           # back to the format's own ranges
+        if not self._fixed_capacity:
+            self._capacity = max(self._capacity, speed)
+        self._reset()
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  POSTPROCESSORS
 # ══════════════════════════════════════════════════════════════════════════════
 
+# acodec filter for streams FFmpegExtractAudio can copy into each codec as is
+_NATIVE_ACODEC = {
+    "m4a":  "acodec^=mp4a",
+    "mp3":  "acodec=mp3",
+    "opus": "acodec=opus",
+    "flac": "acodec=flac",
+}
+
+
+def audio_format(codec: str) -> str:
+    """
+    Format selector for codec. A stream already in the target codec wins so
+    FFmpegExtractAudio only remuxes it (-acodec copy, no quality setting
+    involved); anything else is the fallback and gets re-encoded.
+    """
+    native = f"[{_NATIVE_ACODEC[codec]}]"
+    return f"bestaudio{native}/bestaudio/best{native}/best"
+
+
 def build_postprocessors(codec: str, quality: str, embed_thumb: bool) -> list[dict]:
+    """The stock yt-dlp chain — audio_pp() falls back to it."""
     pp: list[dict] = [
         {"key": "FFmpegMetadata", "add_metadata": True},
         {
@@ -546,91 +1693,1340 @@ def build_postprocessors(codec: str, quality: str, embed_thumb: bool) -> list[di
         },
     ]
     if embed_thumb:
-        pp += [
-            {"key": "FFmpegThumbnailsConvertor", "format": "jpg"},
-            {"key": "EmbedThumbnail"},
-            # NOTE: Do NOT also set "embedthumbnail": True in ydl_opts —
-            # EmbedThumbnail postprocessor is the single source of truth.
-        ]
+        # The cover arrives as a ready jpg from the artwork cache (artwork_pp)
+        pp.append({"key": "EmbedThumbnail"})
+        # NOTE: Do NOT also set "embedthumbnail": True in ydl_opts —
+        # EmbedThumbnail postprocessor is the single source of truth.
     return pp
 
 
-# ══════════════════════════════════════════════════════════════════════════════
-#  TITLE RESOLVER
-# ══════════════════════════════════════════════════════════════════════════════
+_COVER_MUX = {"m4a", "mp3", "flac"}     # ffmpeg can mux a cover into these (ogg: no)
 
-def resolve_title(url: str) -> str:
-    """Silently fetch video title for display before downloading."""
-    try:
-        with YoutubeDL({
-            "quiet":         True,
-            "no_warnings":   True,
-            "skip_download": True,
-            "logger":        SilentLogger(),
-            "extractor_args": {
-                "youtube": {"player_client": ["tv_embedded", "android"]},
-            },
-        }) as ydl:
-            info = ydl.extract_info(url, download=False)
-            return info.get("title", "") if info else ""
-    except Exception:
-        return ""
+def _stream_codec(acodec: str | None) -> str | None:
+    """info["acodec"] ("mp4a.40.2", "opus", …) as ffmpeg names it."""
+    if not acodec or acodec == "none":
+        return None
+    name = acodec.split(".")[0].lower()
+    return {"mp4a": "aac"}.get(name, name)
 
 
-# ══════════════════════════════════════════════════════════════════════════════
-#  SINGLE DOWNLOAD
-# ══════════════════════════════════════════════════════════════════════════════
+def can_fuse(info: dict, codec: str, cover: str | None) -> bool:
+    """True when one ffmpeg pass can produce the final file (see fused_args)."""
+    return (_stream_codec(info.get("acodec")) is not None
+            and info.get("vcodec") in (None, "none")
+            and (cover is None or codec in _COVER_MUX))
 
-def download_one(url: str, cfg: dict, archive_path: Path | None) -> str:
+
+def fused_args(ydl: YoutubeDL, info: dict, codec: str, quality: str,
+               final: str, cover: str | None) -> tuple[list[str], list[str]]:
     """
-    Download audio for one URL.
-    Returns: 'done' | 'skipped' | 'error'
+    Extra inputs (after the audio at index 0) and output options for one
+    ffmpeg pass writing final: audio copied when it is already in codec,
+    otherwise encoded with FFmpegExtractAudioPP's quality arguments, plus
+    chapters and tags from FFmpegMetadataPP and cover as attached picture.
+    Extra inputs other than cover are temporary and the caller's to delete.
     """
-    music_dir = get_music_dir()
-    playlist  = "list=" in url
+    from yt_dlp.postprocessor.ffmpeg import ACODECS, FFmpegExtractAudioPP, FFmpegMetadataPP
+    from yt_dlp.utils import replace_extension
 
-    outtmpl = str(
-        music_dir / "%(playlist_title)s" / "%(playlist_index)s - %(title)s.%(ext)s"
-        if playlist else
-        music_dir / "%(title)s.%(ext)s"
-    )
+    source = _stream_codec(info.get("acodec"))
+    _, encoder, extra = ACODECS[codec]
+    if source == codec or (source == "aac" and codec == "m4a"):
+        encoder = "copy"
+    else:
+        extract = FFmpegExtractAudioPP(ydl, codec, "0" if codec == "flac" else quality)
+        extra   = extract._quality_args(encoder)
+    opts:   list[str] = ["-map", "0:a:0", "-c:a", encoder, *extra]
+    inputs: list[str] = []
+
+    meta = FFmpegMetadataPP(ydl)
+    meta._fixup_chapters(info)
+    if info.get("chapters"):
+        chapters = replace_extension(final, "meta")
+        inputs.append(chapters)
+        opts += itertools.chain(*meta._get_chapter_opts(info["chapters"], chapters))
+    if cover:
+        inputs.append(cover)
+        opts += ["-map", f"{len(inputs)}:v:0", "-c:v", "copy",
+                 "-disposition:v:0", "attached_pic",
+                 "-metadata:s:v", "title=Album cover",
+                 "-metadata:s:v", "comment=Cover (front)"]
+        if codec == "mp3":
+            opts += ["-id3v2_version", "3"]
+    opts += itertools.chain(*meta._get_metadata_opts(info))
+    return inputs, opts
+
+
+def audio_pp(codec: str, quality: str, embed_thumb: bool):
+    """
+    Post-processing in one ffmpeg run per track: transcode (or stream copy),
+    tags and cover art go into a single output file, where the
+    build_postprocessors() chain re-reads and re-writes it once per step.
+    Sources can_fuse() turns down go through the chain instead.
+    """
+    from yt_dlp.postprocessor import get_postprocessor
+    from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+    from yt_dlp.utils import prepend_extension, replace_extension
+
+    class _AudioPP(FFmpegPostProcessor):
+        def run(self, info: dict):
+            path  = info["filepath"]
+            cover = next((t["filepath"] for t in reversed(info.get("thumbnails") or [])
+                          if t.get("filepath") and os.path.exists(t["filepath"])), None)
+            if not embed_thumb:
+                cover = None
+            if not can_fuse(info, codec, cover):
+                return self._chain(info)
+
+            final = replace_extension(path, codec, info["ext"])
+            extra, opts = fused_args(self._downloader, info, codec, quality, final, cover)
+            temp  = prepend_extension(final, "temp")
+            self.run_ffmpeg_multiple_files([path, *extra], temp, opts)
+            os.replace(temp, final)
+            leftovers = extra                 # chapters file, cover
+            if final != path:
+                leftovers.append(path)
+            info["filepath"], info["ext"] = final, codec
+            return leftovers, info
+
+        def _chain(self, info: dict):
+            for spec in build_postprocessors(codec, quality, embed_thumb):
+                spec = dict(spec)
+                pp   = get_postprocessor(spec.pop("key"))(self._downloader, **spec)
+                info = self._downloader.run_pp(pp, info)
+            return [], info
+
+    return _AudioPP()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  ENCODE STAGE — ffmpeg post-processing in a process pool
+#  The network stage only fetches bestaudio (+ thumbnail) and hands each file
+#  over; transcoding, tagging and artwork run here while the next track is
+#  already downloading.
+# ══════════════════════════════════════════════════════════════════════════════
 
-    with Spinner("resolving"):
-        title = resolve_title(url)
+class _QuietLogger:
+    """Encode workers stay silent — failures surface through the future."""
+    def debug(self,   _: str) -> None: pass
+    def info(self,    _: str) -> None: pass
+    def warning(self, _: str) -> None: pass
+    def error(self,   _: str) -> None: pass
+
+
+_encoder: YoutubeDL | None = None   # one per encode worker process
+_stage_times: dict[str, float] = {}  # postprocessor key → seconds, this track
+_stage_clock = _StageClock()
+
+def _encoder_init(codec: str, quality: str, embed_thumb: bool) -> None:
+    global _encoder
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # the parent handles Ctrl+C
+    _encoder = new_ydl({
+        "logger":              _QuietLogger(),
+        "postprocessor_hooks": [_encoder_hook],
+    })
+    _encoder.add_post_processor(audio_pp(codec, quality, embed_thumb))
+
+def _encoder_hook(d: dict) -> None:
+    key = d.get("postprocessor", "")
+    if d["status"] == "started":
+        _stage_clock.start(key)
+    elif d["status"] == "finished":
+        elapsed = _stage_clock.finish(key)
+        if elapsed is not None:
+            _stage_times[key] = _stage_times.get(key, 0.0) + elapsed
+
+def _encode_track(info: dict) -> dict:
+    """Returns the final file and how long each postprocessor took."""
+    _stage_times.clear()
+    _stage_clock.clear()
+    files_to_move = info.pop("__files_to_move", None) or {}
+    info.pop("__postprocessors", None)   # fixups, already run by the network stage
+    info = _encoder.post_process(info["filepath"], info, files_to_move)
+    stages = {k: v for k, v in _stage_times.items() if k not in _PP_SILENT}
+    return {"filepath": info.get("filepath"), "stages": stages}
+
+
+def handoff_pp(handoff: Callable[[dict], None]):
+    """Last network-stage postprocessor: passes the file to the encode stage."""
+    from yt_dlp.postprocessor import PostProcessor
+
+    class _HandoffPP(PostProcessor):
+        def run(self, info: dict):
+            handoff(sanitize_info(info))
+            return [], info
+
+    return _HandoffPP()
+
+
+class EncodeStage:
+    """
+    CPU half of the download pipeline.
 
+    Usage:
+        stage = EncodeStage(cfg, on_row_done)
+        result = download_one(url, session, handoff=stage.handoff(i))
+        _settle(states, i, stage.seal(i, result))   # 'encoding' while files are queued
+        ...
+        stage.close()                       # waits for the remaining encodes
+
+    on_row_done(row, ok) fires from a pool thread once every file of a
+    sealed row has been encoded — possibly before the runner gets to record
+    what seal() returned, hence _settle(); on_encoded(row, result), if given,
+    for every file with what _encode_track() returned.
+
+    A track goes into the archive only once its encode succeeds (the
+    network stage sees an ArchiveView). A failed or cancelled encode keeps
+    the downloaded source, so the next run re-encodes it without fetching.
+    """
+
+    def __init__(self, cfg: dict, on_row_done: Callable[[int, bool], None],
+                 on_encoded: Callable[[int, dict], None] | None = None,
+                 archive: DownloadArchive | None = None) -> None:
+        self._cfg         = cfg
+        self._archive     = archive
+        self._pool: ProcessPoolExecutor | None = None   # started on first handoff
+        self._lock        = threading.Lock()
+        self._pending:  dict[int, int] = {}
+        self._sealed:   set[int] = set()
+        self._failed:   set[int] = set()
+        self._on_row_done = on_row_done
+        self._on_encoded  = on_encoded
+
+    def handoff(self, row: int) -> Callable[[dict], None]:
+        def submit(info: dict) -> None:
+            with self._lock:
+                self._pending[row] = self._pending.get(row, 0) + 1
+                pool = self._start()
+            future = pool.submit(_encode_track, info)
+            future.add_done_callback(lambda f: self._finished(row, f, info))
+        return submit
+
+    def _start(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor   # pulls in multiprocessing
+            cfg = self._cfg
+            self._pool = ProcessPoolExecutor(
+                max_workers=cfg["encoders"],
+                initializer=_encoder_init,
+                initargs=(cfg["codec"], cfg["quality"], cfg["thumbnail"]),
+            )
+        return self._pool
+
+    def seal(self, row: int, result: str) -> str:
+        """No more files will arrive for row — returns the state to show now."""
+        with self._lock:
+            if row in self._failed:
+                return "error"
+            if not self._pending.get(row):
+                return result
+            if result != "done":
+                self._failed.add(row)
+            self._sealed.add(row)
+            return "encoding"
+
+    def _finished(self, row: int, future: Future, info: dict) -> None:
+        try:
+            err = future.exception()
+        except CancelledError as exc:
+            err = exc
+        if err is None:
+            key = info_archive_id(info)
+            if self._archive is not None and key is not None:
+                self._archive.add(key)
+        with self._lock:
+            self._pending[row] -= 1
+            if err is not None:
+                self._failed.add(row)
+            settled = row in self._sealed and not self._pending[row]
+            ok      = row not in self._failed
+        if err is not None and not isinstance(err, CancelledError):
+            _print_error(f"encoding failed — {err}")
+        elif err is None and self._on_encoded:
+            self._on_encoded(row, future.result())
+        if settled:
+            self._on_row_done(row, ok)
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return any(self._pending.values())
+
+    def close(self, cancel: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=cancel)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  RESOLVER
+# ══════════════════════════════════════════════════════════════════════════════
+
+def resolve_info(ydl: YoutubeDL, url: str,
+                 cache: MetadataCache | None = None) -> dict | None:
+    """
+    Extract metadata once, without resolving formats or playlist entries.
+    The same dict is later handed to ydl.process_ie_result() for the actual
+    download, so the title header costs no extra extraction round trip.
+    Returns None when yt-dlp matched the URL against the archive up front.
+
+    A cache hit returns the stored dict without touching the network; its
+    stream URLs may have expired, which ensure_streams() fixes lazily.
+    """
+    if cache is not None:
+        info = cache.get(url)
+        if info is not None:
+            return info
+    info = ydl.extract_info(url, download=False, process=False)
+    if cache is not None and _cacheable(info):
+        cache.put(url, info)
+    return info
+
+
+def ensure_streams(ydl: YoutubeDL, url: str, info: dict,
+                   cache: MetadataCache | None = None) -> dict:
+    """Re-extract a cached dict whose signed stream URLs have run out."""
+    if "__cached_at" not in info or streams_fresh(info):
+        return info
+    fresh = ydl.extract_info(url, download=False, process=False)
+    if cache is not None and _cacheable(fresh):
+        cache.put(url, fresh)
+    return fresh
+
+
+def _print_track_header(info: dict, playlist: bool, extra: dict | None = None) -> None:
+    title = info.get("title", "")
     if title:
-        print(f"  {smoke('track')}  {white(title)}")
-    if playlist:
-        print(f"  {smoke('type')}   {ghost('playlist')}")
+        _out(f"  {smoke('track')}  {white(title)}")
+    if extra:
+        where = f"{extra['playlist_title']}  ·  {extra['playlist_index']}/{extra['n_entries']}"
+        _out(f"  {smoke('from')}   {ghost(where)}")
+    elif playlist:
+        _out(f"  {smoke('type')}   {ghost('playlist')}")
     _ln()
 
-    ydl_opts: dict = {
-        "format":             "bestaudio/best",
-        "outtmpl":            outtmpl,
-        "logger":             SilentLogger(),
-        "restrictfilenames":  True,
-        "writethumbnail":     cfg["thumbnail"],
-        # tv_embedded + android: no JS challenge, no PO token required
-        "extractor_args": {
-            "youtube": {"player_client": ["tv_embedded", "android"]},
-        },
-        "retries":            10,
-        "fragment_retries":   10,
-        "concurrent_fragment_downloads": 1,
-        "postprocessors":     build_postprocessors(
-            cfg["codec"], cfg["quality"], cfg["thumbnail"]
-        ),
-        "progress_hooks":     [make_progress_hook()],
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PREFETCH — upcoming rows are resolved while the current track downloads
+#  One background thread with its own warm Downloader walks the queue in
+#  order and keeps up to cfg["prefetch"] info dicts ready, so a worker that
+#  moves on to its next row starts transferring instead of extracting.
+# ══════════════════════════════════════════════════════════════════════════════
+
+class Prefetcher:
+    """
+    Look-ahead resolver shared by every worker.
+
+    Usage:
+        prefetch.put(url) ...               # in queue order
+        info = prefetch.take(ydl, url)      # instead of resolve_info()
+
+    At most `depth` resolved dicts wait to be taken; the thread sleeps until
+    a worker takes one. take() on a URL the thread has not reached yet drops
+    it from the look-ahead and resolves it inline; on the URL being resolved
+    right now it waits for that result rather than extracting twice. An
+    extraction error is raised by take(), on the track it belongs to.
+    """
+
+    def __init__(self, session: Session, depth: int) -> None:
+        self.depth    = depth
+        self._session = session
+        self._cond    = threading.Condition()
+        self._pending: deque[str] = deque()
+        self._ready:   dict[str, object] = {}
+        self._current: str | None = None
+        self._stop    = False
+        self._thread: threading.Thread | None = None
+
+    def put(self, url: str) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True,
+                                                name="prefetch")
+                self._thread.start()
+            self._pending.append(url)
+            self._cond.notify_all()
+
+    def take(self, ydl: YoutubeDL, url: str) -> dict | None:
+        with self._cond:
+            while url == self._current:
+                self._cond.wait()
+            if url in self._ready:
+                result = self._ready.pop(url)
+                self._cond.notify_all()
+                if isinstance(result, BaseException):
+                    raise result
+                return result
+            try:
+                self._pending.remove(url)
+            except ValueError:
+                pass
+        return resolve_info(ydl, url, self._session.cache)
+
+    def _next(self) -> str | None:
+        """Next URL to resolve once there is room, or None to stop."""
+        with self._cond:
+            while not self._stop:
+                if not self._pending or len(self._ready) >= self.depth:
+                    self._cond.wait()
+                    continue
+                url  = self._pending[0]
+                wait = self._session.hosts.backoff(url)
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._pending.popleft()
+                if url not in self._ready:
+                    self._current = url
+                    return url
+        return None
+
+    def _loop(self) -> None:
+        dl = self._session.downloader()
+        while (url := self._next()) is not None:
+            dl.url = url                       # a 429 here is blamed on url's host
+            try:
+                result: object = resolve_info(dl.ydl, url, self._session.cache)
+            except (Exception, SystemExit) as exc:
+                result = exc
+            with self._cond:
+                self._current    = None
+                self._ready[url] = result
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stop the thread; after a cancel it is left to finish on its own."""
+        with self._cond:
+            self._stop = True
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread is not None and not _CANCEL.is_set():
+            self._thread.join()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  STREAMING — --stream pipes the download straight into ffmpeg
+#  The selected format is fetched in ranged chunks and written to ffmpeg's
+#  stdin; ffmpeg writes the finished file (codec, tags, cover) directly, so
+#  the source audio never touches the disk. Opt-in: a source ffmpeg cannot
+#  read from a pipe (MP4 with its index at the end) is fetched a second
+#  time through the normal download, as is any track that can't be streamed.
+# ══════════════════════════════════════════════════════════════════════════════
+
+STREAM_READ = 1 << 16     # bytes per read from the response / write to ffmpeg
+
+# MP4-family files usually keep their index (moov) at the end, which ffmpeg
+# cannot seek to on a pipe; only the fragmented DASH variants stream.
+_SEEKING_EXTS = {"mp4", "m4a", "mov", "3gp"}
+
+
+def stream_download(ydl: YoutubeDL, info: dict, cfg: dict,
+                    artwork: ArtworkCache | None,
+                    progress: Callable[[dict], None],
+                    extra: dict | None = None) -> dict | None:
+    """
+    Stream info's best audio format into ffmpeg (the caller records it in
+    the archive). Returns the final info dict, or None when this track has to
+    take the normal download path (fragmented or multi-stream formats,
+    unfragmented MP4, a cover ffmpeg cannot mux, ffmpeg rejecting the stream).
+    """
+    from yt_dlp.networking import Request
+    from yt_dlp.networking.exceptions import RequestError
+    from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessor
+    from yt_dlp.utils import prepend_extension, replace_extension
+
+    info = ydl.process_ie_result(dict(info), download=False, extra_info=extra or {})
+    if info.get("requested_formats") or info.get("protocol") not in ("http", "https"):
+        return None
+    if info.get("ext") in _SEEKING_EXTS and not str(info.get("container", "")).endswith("_dash"):
+        return None
+    codec = cfg["codec"]
+    cover = None
+    if artwork is not None:
+        try:
+            cover = artwork.cover(ydl, info)
+        except Exception as exc:
+            _print_warning(f"artwork unavailable — {exc}")
+    if not can_fuse(info, codec, str(cover) if cover else None):
+        return None
+
+    final = replace_extension(ydl.prepare_filename(info), codec, info["ext"])
+    temp  = prepend_extension(final, "part")
+    os.makedirs(os.path.dirname(os.path.abspath(final)), exist_ok=True)
+    extra_in, opts = fused_args(ydl, info, codec, cfg["quality"], final,
+                                str(cover) if cover else None)
+    cmd = [FFmpegPostProcessor(ydl).executable, "-y", "-loglevel", "error",
+           "-i", "pipe:0", *itertools.chain(*(("-i", f) for f in extra_in)), *opts, temp]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    headers = dict(info.get("http_headers") or {})
+    chunk   = (ydl.params.get("http_chunk_size")             # same precedence as HttpFD
+               or (info.get("downloader_options") or {}).get("http_chunk_size") or 0)
+    total   = info.get("filesize")
+    got, tries, t0, shown = 0, 0, time.monotonic(), 0.0
+    reason: str | None = None
+
+    def report(status: str) -> None:
+        elapsed = time.monotonic() - t0
+        speed   = got / elapsed if elapsed else None
+        progress({
+            "status":           status,
+            "downloaded_bytes": got,
+            "total_bytes":      total,
+            "elapsed":          elapsed,
+            "speed":            speed,
+            "eta":              (total - got) / speed if total and speed else None,
+            "filename":         final,
+            "tmpfilename":      temp,
+            "info_dict":        info,
+        })
+
+    try:
+        try:
+            while total is None or got < total:
+                ranged = dict(headers)
+                if chunk or got:
+                    ranged["Range"] = f"bytes={got}-{got + chunk - 1 if chunk else ''}"
+                try:
+                    with ydl.urlopen(Request(info["url"], headers=ranged)) as resp:
+                        if resp.status == 200 and got:
+                            reason = "server cannot resume"
+                            break
+                        m = re.search(r"/(\d+)$", resp.headers.get("Content-Range", ""))
+                        if m:
+                            total = int(m.group(1))
+                        elif resp.status == 200:
+                            total = int(resp.headers.get("Content-Length") or 0) or None
+                        while data := resp.read(STREAM_READ):
+                            proc.stdin.write(data)
+                            got += len(data)
+                            if time.monotonic() - shown >= FRAME_S:
+                                shown = time.monotonic()
+                                report("downloading")
+                        whole = resp.status == 200
+                except RequestError:
+                    tries += 1
+                    if tries > ydl.params.get("retries", 10):
+                        raise
+                    time.sleep(_retry_sleep(tries))
+                    continue
+                tries = 0
+                if whole or total is None:
+                    break
+        except BrokenPipeError:
+            pass                   # ffmpeg stopped reading; its stderr says why
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        if reason:
+            proc.kill()
+        err = proc.stderr.read().decode(errors="replace").strip()
+        if proc.wait():
+            reason = reason or (err.splitlines()[-1] if err else "ffmpeg failed")
+            _print_warning(f"cannot stream this one ({reason})  ·  downloading it instead")
+            return None
+        os.replace(temp, final)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        for f in [temp, *(f for f in extra_in if f != str(cover))]:
+            if os.path.exists(f):
+                os.remove(f)
+
+    total = got
+    report("finished")
+    info["filepath"], info["ext"] = final, codec
+    return info
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  HOST SCHEDULER — per-host pacing and backoff shared by every worker
+#  Each host gets a backoff window, and once it has answered 429 a token
+#  bucket for track starts and a smaller cap on tracks in flight. A host
+#  that never throttles is not paced at all.
+# ══════════════════════════════════════════════════════════════════════════════
+
+HOST_RATE       = 1.0       # track starts per second after the first strike
+HOST_RATE_MIN   = 1 / 30    # floor after repeated strikes
+BACKOFF_BASE    = 4.0       # seconds; doubles per strike, jittered
+BACKOFF_MAX     = 300.0
+HOST_RECOVER    = 5         # clean tracks in a row that work off one strike
+RETRY_SLEEP_MAX = 30.0      # cap for yt-dlp's own per-request retries
+
+_HOST_ALIASES = {"youtu.be": "youtube.com", "youtube-nocookie.com": "youtube.com"}
+
+
+def host_key(url: str) -> str:
+    """Bucket a URL is paced under: its host's last two labels, aliased."""
+    host = (urlparse(url).hostname or "").lower()
+    if ":" in host or host.replace(".", "").isdigit():
+        return host                                   # IP literal
+    base = ".".join(host.split(".")[-2:])
+    return _HOST_ALIASES.get(base, base)
+
+
+def _retry_sleep(n: int) -> float:
+    """retry_sleep_functions entry: exponential backoff with full jitter."""
+    return random.uniform(0, min(RETRY_SLEEP_MAX, 2.0 ** n))
+
+RETRY_SLEEP = {"http": _retry_sleep, "fragment": _retry_sleep, "extractor": _retry_sleep}
+
+
+class _Host:
+    """
+    Pacing state for one host. strikes counts 429 bursts not yet worked off
+    by clean tracks; each one halves the start rate and the in-flight cap
+    and doubles the next backoff.
+    """
+
+    __slots__ = ("jobs", "tokens", "stamp", "active", "until", "strikes", "clean")
+
+    def __init__(self, jobs: int) -> None:
+        self.jobs    = jobs
+        self.tokens  = 0.0
+        self.stamp   = time.monotonic()
+        self.active  = 0
+        self.until   = 0.0              # no new tracks before this (backoff)
+        self.strikes = 0
+        self.clean   = 0
+
+    @property
+    def rate(self) -> float:
+        return max(HOST_RATE_MIN, HOST_RATE / 2 ** (self.strikes - 1))
+
+    @property
+    def limit(self) -> int:
+        return max(1, self.jobs >> self.strikes)
+
+    def wait(self, now: float) -> float:
+        """Seconds until another track may start here; inf = until one ends."""
+        if self.active >= self.limit:
+            return math.inf
+        if not self.strikes:
+            return 0.0
+        if now < self.until:
+            return self.until - now
+        self.tokens = min(float(self.limit), self.tokens + (now - self.stamp) * self.rate)
+        self.stamp  = now
+        return max((1 - self.tokens) / self.rate, 0.0)
+
+
+class HostScheduler:
+    """
+    Hands pending queue rows to workers.
+
+    Usage:
+        sched.put(i, track) ...; sched.close()
+        while (job := sched.take()) is not None:   # in every worker
+            ...; sched.done(track.url, ok)
+
+    take() returns the lowest pending row whose host is ready, so while one
+    host backs off the rest of the queue keeps moving. A 429 seen by any
+    worker (throttled()) pauses that host for all of them and halves its
+    rate and concurrency; a run of clean tracks afterwards takes it back.
+    """
+
+    def __init__(self, jobs: int) -> None:
+        self._jobs   = jobs
+        self._cond   = threading.Condition()
+        self._hosts:  dict[str, _Host] = {}
+        self._queues: dict[str, deque[tuple[int, Track]]] = {}
+        self._closed = False
+
+    def _host(self, key: str) -> _Host:
+        host = self._hosts.get(key)
+        if host is None:
+            host = self._hosts[key] = _Host(self._jobs)
+        return host
+
+    def put(self, row: int, track: Track) -> None:
+        with self._cond:
+            self._queues.setdefault(host_key(track.url), deque()).append((row, track))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """No more rows are coming; take() returns None once drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        with self._cond:
+            self._queues.clear()
+            self._closed = True
+            self._cond.notify_all()
+
+    def take(self) -> tuple[int, Track] | None:
+        with self._cond:
+            while not _CANCEL.is_set():
+                now, soonest, ready = time.monotonic(), math.inf, None
+                for key, queue in self._queues.items():
+                    if not queue:
+                        continue
+                    wait = self._host(key).wait(now)
+                    if wait == 0 and (ready is None or queue[0][0] < self._queues[ready][0][0]):
+                        ready = key
+                    soonest = min(soonest, wait)
+                if ready is not None:
+                    host = self._hosts[ready]
+                    host.tokens = max(0.0, host.tokens - 1)
+                    host.active += 1
+                    return self._queues[ready].popleft()
+                if self._closed and not any(self._queues.values()):
+                    return None
+                self._cond.wait(min(soonest, 0.5))
+        return None
+
+    def done(self, url: str, ok: bool) -> None:
+        with self._cond:
+            host = self._host(host_key(url))
+            host.active -= 1
+            if ok and host.strikes and time.monotonic() >= host.until:
+                host.clean += 1
+                if host.clean >= HOST_RECOVER:
+                    host.strikes -= 1
+                    host.clean    = 0
+            self._cond.notify_all()
+
+    def backoff(self, url: str) -> float:
+        """Seconds left before url's host may be contacted again."""
+        with self._cond:
+            host = self._hosts.get(host_key(url))
+            return max(0.0, host.until - time.monotonic()) if host else 0.0
+
+    def throttled(self, url: str) -> None:
+        """A request to url's host got 429 — back the whole host off."""
+        key = host_key(url)
+        with self._cond:
+            host = self._host(key)
+            now  = time.monotonic()
+            if now < host.until:
+                return                 # same burst, already backing off
+            host.strikes += 1
+            host.clean    = 0
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (host.strikes - 1))
+            delay = random.uniform(delay / 2, delay)
+            host.until  = now + delay
+            host.tokens = 0.0
+            host.stamp  = host.until    # the bucket refills from the end of backoff
+        _print_warning(f"{key} is rate limiting  ·  no new tracks from it for {delay:.0f}s")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SESSION — one warm YoutubeDL per worker, shared archive / cache / encoder
+# ══════════════════════════════════════════════════════════════════════════════
+
+_EXTRACTOR_ARGS = {
+    # tv_embedded + android: no JS challenge, no PO token required
+    "youtube": {"player_client": ["tv_embedded", "android"]},
+}
+
+
+class Downloader:
+    """
+    A YoutubeDL that lives for the whole session on one worker thread.
+
+    Building a YoutubeDL re-initialises extractors, the cookie jar and the
+    HTTP connection pool, so it is built once and prepare() only swaps what
+    differs between tracks: output template, progress and stage display,
+    the encode handoff target and the URL whose host a 429 is blamed on.
+    """
+
+    def __init__(self, cfg: dict, archive: DownloadArchive | None,
+                 encode: bool, hosts: HostScheduler,
+                 artwork: ArtworkCache | None = None) -> None:
+        self._hook    = make_progress_hook()
+        self._handoff: Callable[[dict], None] | None = None
+        self._cfg     = cfg
+        self._artwork = artwork
+        self._archive = archive
+        self.tuner    = FragmentTuner(cfg)
+        self.stages   = StageHook()
+        self.timing: TrackTiming | None = None
+        self.url      = ""
+
+        opts: dict = {
+            "format":             audio_format(cfg["codec"]),
+            "outtmpl":            _outtmpl(False),
+            "logger":             SilentLogger(
+                self.tuner.fragment_retry, lambda: hosts.throttled(self.url)
+            ),
+            "restrictfilenames":  True,
+            "writethumbnail":     False,    # artwork_pp fetches covers
+            "extractor_args":     _EXTRACTOR_ARGS,
+            "retries":            10,
+            "continuedl":         True,     # pick up .part files left by a cancel
+            "fragment_retries":   10,
+            "retry_sleep_functions": RETRY_SLEEP,
+            "concurrent_fragment_downloads": self.tuner.fragments,
+            "progress_hooks":     [self._progress],
+            "postprocessor_hooks": [lambda d: self.stages(d)],
+        }
+        if archive is not None:
+            opts["download_archive"] = ArchiveView(archive) if encode else archive
+
+        self.ydl = new_ydl(opts)
+        if artwork is not None:
+            self.ydl.add_post_processor(artwork_pp(artwork), when="before_dl")
+        if encode:
+            self.ydl.add_post_processor(
+                handoff_pp(lambda info: self._handoff(info)), when="post_process"
+            )
+        else:
+            self.ydl.add_post_processor(
+                audio_pp(cfg["codec"], cfg["quality"], cfg["thumbnail"]), when="post_process"
+            )
+
+    def _progress(self, d: dict) -> None:
+        self.tuner.observe(d)
+        if self.timing is not None:
+            self.timing.progress(d)
+        self._hook(d)
+
+    def prepare(self, url: str, playlist: bool, live: bool,
+                handoff: Callable[[dict], None] | None,
+                panel: "LiveQueue | None" = None,
+                timing: TrackTiming | None = None) -> YoutubeDL:
+        self.url = url
+        self.tuner.apply(self.ydl.params)
+        self.ydl.params["outtmpl"]["default"] = _outtmpl(playlist)
+        self._hook    = make_progress_hook(live, panel)
+        self.stages   = StageHook(live, timing)
+        self.timing   = timing
+        self._handoff = handoff
+        return self.ydl
+
+    def stream(self, info: dict, extra: dict | None = None) -> bool:
+        """--stream: True once the track is finished, False to download it normally."""
+        done = stream_download(self.ydl, info, self._cfg, self._artwork,
+                               self._progress, extra)
+        if done is None:
+            return False
+        key = info_archive_id(done)
+        if self._archive is not None and key is not None:
+            self._archive.add(key)
+        if self.timing is not None:
+            self.timing.output(done["filepath"])
+        return True
+
+    def close(self) -> None:
+        self.ydl.close()
+
+
+def _outtmpl(playlist: bool) -> str:
+    music_dir = get_music_dir()
+    return str(
+        music_dir / "%(playlist_title)s" / "%(playlist_index)s - %(title)s.%(ext)s"
+        if playlist else
+        music_dir / "%(title)s.%(ext)s"
+    )
+
+
+class Session:
+    """
+    Everything one run shares: settings, archive, metadata and artwork
+    caches, library index (with --library), encode stage, host scheduler,
+    look-ahead prefetcher, the dashboard panel (interactive runs only), run
+    metrics (with --report), and one Downloader per worker thread (created
+    on first use).
+    """
+
+    def __init__(self, cfg: dict) -> None:
+        self.cfg     = cfg
+        self.archive = DownloadArchive(get_archive_path()) if cfg["archive"] else None
+        self.cache   = (MetadataCache(get_cache_dir() / "metadata.sqlite")
+                        if cfg["cache"] else None)
+        self.artwork = (ArtworkCache(get_cache_dir() / "artwork", cfg["artwork"])
+                        if cfg["thumbnail"] else None)
+        self.stage: EncodeStage | None = None
+        self.hosts   = HostScheduler(cfg["jobs"])
+        self.prefetch = Prefetcher(self, cfg["prefetch"]) if cfg["prefetch"] else None
+        self.sync    = (PlaylistSync(get_sync_path(), self.archive)
+                        if cfg["sync"] and self.archive is not None else None)
+        self.library = (LibraryIndex(get_library_path(), get_music_dir(), cfg["codec"])
+                        if cfg["library"] else None)
+        if self.library is not None:
+            with Spinner("indexing library"):
+                self.library.refresh()
+        self.panel: LiveQueue | None = None
+        self.metrics = Metrics(Path(cfg["report"])) if cfg["report"] else None
+        self._local = threading.local()
+        self._lock  = threading.Lock()
+        self._downloaders: list[Downloader] = []
+        self._flat: YoutubeDL | None = None
+
+    def start_encoder(self, on_row_done: Callable[[int, bool], None]) -> None:
+        if self.cfg["encoders"] <= 0:
+            return
+        metrics = self.metrics
+        if metrics is None:
+            self.stage = EncodeStage(self.cfg, on_row_done, archive=self.archive)
+            return
+
+        def row_done(row: int, ok: bool) -> None:
+            metrics.finish(row, "done" if ok else "error")
+            on_row_done(row, ok)
+
+        self.stage = EncodeStage(self.cfg, row_done, on_encoded=metrics.encoded,
+                                 archive=self.archive)
+
+    def downloader(self) -> Downloader:
+        dl = getattr(self._local, "downloader", None)
+        if dl is None:
+            dl = Downloader(self.cfg, self.archive, encode=self.stage is not None,
+                            hosts=self.hosts, artwork=self.artwork)
+            self._local.downloader = dl
+            with self._lock:
+                self._downloaders.append(dl)
+        return dl
+
+    def enqueue(self, row: int, track: Track) -> None:
+        """Hand a row to the workers and start resolving it ahead of them."""
+        self.hosts.put(row, track)
+        if self.prefetch is not None:
+            self.prefetch.put(track.url)
+
+    def in_library(self, ydl: YoutubeDL, info: dict, extra: dict | None) -> bool:
+        """--library: info's source, or the file it would be saved as, is already there."""
+        if self.library is None:
+            return False
+        if info.get("webpage_url", "") in self.library:
+            return True
+        from yt_dlp.utils import replace_extension
+        name = ydl.prepare_filename({**info, **(extra or {})})
+        return os.path.exists(replace_extension(name, self.cfg["codec"], info.get("ext")))
+
+    def resolve(self, ydl: YoutubeDL, url: str) -> dict | None:
+        if self.prefetch is not None:
+            return self.prefetch.take(ydl, url)
+        return resolve_info(ydl, url, self.cache)
+
+    def flat(self) -> YoutubeDL:
+        """YoutubeDL for flat playlist walks (main thread only)."""
+        if self._flat is None:
+            self._flat = new_ydl({
+                "extract_flat":   "in_playlist",
+                "logger":         SilentLogger(),
+                "extractor_args": _EXTRACTOR_ARGS,
+                "retry_sleep_functions": RETRY_SLEEP,
+            })
+        return self._flat
+
+    def close(self, spinner: bool = False) -> None:
+        if self.prefetch:
+            self.prefetch.close()
+        if self.stage:
+            if self.stage.busy and not _CANCEL.is_set() and spinner:
+                with Spinner("encoding  ·  finishing queued tracks"):
+                    self.stage.close()
+            else:
+                self.stage.close(cancel=_CANCEL.is_set())
+        for dl in self._downloaders:
+            dl.close()
+        if self._flat is not None:
+            self._flat.close()
+        if self.cache:
+            self.cache.close()
+        if self.sync:
+            self.sync.save()
+        if self.library:
+            self.library.close()
+        if self.metrics:
+            self.metrics.close()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PLAYLIST EXPANSION — one queue row per entry
+# ══════════════════════════════════════════════════════════════════════════════
+
+class Track:
+    """One queue row: a URL plus the playlist it was fanned out from, if any."""
+
+    __slots__ = ("url", "title", "playlist")
+
+    def __init__(self, url: str, title: str = "",
+                 playlist: dict | None = None) -> None:
+        self.url      = url
+        self.title    = title
+        self.playlist = playlist   # extra_info for yt-dlp: playlist_title, …
+
+    @property
+    def label(self) -> str:
+        return self.title or self.url
+
+
+def _flat_playlist(ydl: YoutubeDL, url: str,
+                   cache: MetadataCache | None) -> dict | None:
+    if cache is not None:
+        info = cache.get(url, ttl=PLAYLIST_TTL)
+        if info is not None and info.get("_type") == "playlist":
+            return info
+    info = ydl.extract_info(url, download=False)
+    if cache is not None and info and info.get("_type") == "playlist":
+        cache.put(url, info)
+    return info
+
+
+def _playlist_extra(info: dict, index: int, n_entries: int) -> dict:
+    """extra_info for one entry of a fanned-out playlist (see Track)."""
+    return {
+        "playlist":              info.get("title") or info.get("id"),
+        "playlist_id":           info.get("id"),
+        "playlist_title":        info.get("title") or info.get("id"),
+        "playlist_index":        index,
+        "playlist_autonumber":   index,
+        "n_entries":             n_entries,
+        "__last_playlist_index": n_entries,
     }
 
-    if archive_path:
-        ydl_opts["download_archive"] = str(archive_path)
 
-    result = "done"
+def expand_playlists(urls: list[str], session: Session) -> list[Track]:
+    """
+    Replace every playlist URL with one Track per entry, using a flat
+    extraction (a single page walk, no per-entry player requests). Each
+    entry carries the playlist context so the download still lands in
+    ~/Music/<playlist>/<index> - <title>. A playlist that fails to expand
+    stays a single row and is downloaded the old way. With --sync only the
+    entries added since the last run become rows (see PlaylistSync).
+    """
+    tracks: list[Track] = []
+    seen:   set[str]    = set()
+    sync = session.sync
+
+    for url in urls:
+        if "list=" not in url:
+            tracks.append(Track(url))
+            continue
+        walked: tuple[dict, list[tuple[int, dict]], int] | None = None
+        try:
+            if sync is not None:
+                with Spinner("syncing playlist"):
+                    walked = sync.walk(session.flat(), url)
+            else:
+                with Spinner("expanding playlist"):
+                    info = _flat_playlist(session.flat(), url, session.cache)
+                if info and info.get("_type") == "playlist":
+                    entries = [e for e in info.get("entries") or [] if e and e.get("url")]
+                    walked  = (info, list(enumerate(entries, 1)), len(entries))
+        except Exception:
+            walked = None
+        if walked is None:
+            tracks.append(Track(url))
+            continue
+
+        info, entries, n_entries = walked
+        if sync is not None and not entries:
+            name = info.get("title") or info.get("id") or url
+            _out(f"  {smoke('◇')}  {smoke(name)}  {ghost('· up to date')}")
+        for index, entry in entries:
+            if entry["url"] in seen:
+                continue
+            seen.add(entry["url"])
+            tracks.append(Track(entry["url"], entry.get("title") or "",
+                                _playlist_extra(info, index, n_entries)))
+    return tracks
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PLAYLIST SYNC — --sync walks a playlist only as far as it has changed
+#  Per playlist, the entry ids seen last time and its length are kept in
+#  playlists.json beside the archive. Entries are read lazily, page by page:
+#  new ones at the top end the walk at the first known id; when the first
+#  entry is unchanged, new ones are at the bottom and a paged source is read
+#  from the old length on. Entries queued but not yet in the archive are
+#  carried over and queued again next time.
+# ══════════════════════════════════════════════════════════════════════════════
+
+SYNC_CHUNK      = 50                 # entries per read from a paged playlist
+SYNC_FULL_EVERY = 7 * 24 * 3600      # walk everything again after this long
+
+
+def _entries_from(entries, start: int = 0) -> Iterator[dict]:
+    """Playlist entries from start on, fetching pages only as they are read."""
+    if hasattr(entries, "getslice"):               # yt-dlp PagedList
+        while chunk := entries.getslice(start, start + SYNC_CHUNK):
+            yield from (e for e in chunk if e and e.get("url"))
+            start += len(chunk)
+        return
+    for entry in itertools.islice(entries or (), start, None):
+        if entry and entry.get("url"):
+            yield entry
+
+
+def _entry_id(entry: dict) -> str:
+    return entry.get("id") or entry["url"]
+
+
+class PlaylistSync:
+    """
+    --sync state of every playlist walked with it, in playlists.json:
+
+        {"<extractor> <playlist id>": {"count": n, "ids": [...],
+                                       "pending": [entry, ...], "walked": t}}
+
+    ids is the playlist in order as of the last walk and walked the time of
+    the last full one; pending holds entries queued by an earlier run that
+    are not in the archive yet (failed or cancelled), which is why --sync
+    needs the archive.
+    """
+
+    def __init__(self, path: Path, archive: DownloadArchive) -> None:
+        self.path    = path
+        self.archive = archive
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._state: dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self._state = {}
+        self._dirty = False
+
+    def _archived(self, entry: dict) -> bool:
+        key = info_archive_id(entry)
+        if key is not None:
+            return key in self.archive
+        return is_archived(entry["url"], self.archive)
+
+    def walk(self, ydl: YoutubeDL,
+             url: str) -> tuple[dict, list[tuple[int, dict]], int] | None:
+        """
+        Read url's entries only as far as they changed since the last walk.
+        Returns (playlist info, [(index, entry), …] to queue, entry count),
+        or None when url does not resolve to a playlist.
+        """
+        info = ydl.extract_info(url, download=False, process=False)
+        if info and info.get("_type") in ("url", "url_transparent"):
+            info = ydl.extract_info(info["url"], ie_key=info.get("ie_key"),
+                                    download=False, process=False)
+        if not info or info.get("_type") != "playlist":
+            return None
+
+        key     = f"{info.get('extractor_key', '')} {info.get('id')}".lower()
+        state   = self._state.get(key)
+        count   = info.get("playlist_count")
+        entries = info.get("entries")
+        now     = time.time()
+        found: list[tuple[int, dict]] = []
+
+        if state is None or not state["ids"] or now - state["walked"] > SYNC_FULL_EVERY:
+            found = list(enumerate(_entries_from(entries), 1))
+            ids   = [_entry_id(e) for _, e in found]
+            walked = now
+        else:
+            ids, known, walked = state["ids"], set(state["ids"]), state["walked"]
+            rest  = _entries_from(entries)
+            first = next(rest, None)
+            head  = _entry_id(first) if first is not None else None
+            if head is not None and head not in known:
+                # new entries on top: everything past the first known one is old
+                found.append((1, first))
+                for entry in rest:
+                    if _entry_id(entry) in known:
+                        break
+                    found.append((len(found) + 1, entry))
+                ids = [_entry_id(e) for _, e in found] + ids
+            elif head is not None:
+                # known first entry: drop any removed above it; anything new
+                # was added at the bottom (no count at all means unchanged)
+                ids = ids[ids.index(head):]
+                if count is not None and count != len(ids):
+                    start = 1
+                    if count > len(ids) and hasattr(entries, "getslice"):
+                        start, rest = len(ids), _entries_from(entries, len(ids))
+                    tail = [head] if start == 1 else list(ids)
+                    for index, entry in enumerate(rest, start + 1):
+                        tail.append(_entry_id(entry))
+                        if _entry_id(entry) not in known:
+                            found.append((index, entry))
+                    ids = tail
+
+        n_entries = count if count is not None else len(ids)
+        queued = {_entry_id(e) for _, e in found}
+        carry  = [(e["index"], e) for e in (state or {}).get("pending", [])
+                  if e["id"] not in queued]
+        todo   = [(i, e) for i, e in found + carry if not self._archived(e)]
+
+        self._state[key] = {
+            "count":   n_entries,
+            "ids":     ids,
+            "walked":  walked,
+            "pending": [{"id": _entry_id(e), "url": e["url"], "title": e.get("title") or "",
+                         "ie_key": e.get("ie_key"), "index": i} for i, e in todo],
+        }
+        self._dirty = True
+        return info, sorted(todo, key=lambda t: t[0]), n_entries
+
+    def save(self) -> None:
+        """Drop pending entries that reached the archive and write the file."""
+        if not self._dirty:
+            return
+        for state in self._state.values():
+            state["pending"] = [e for e in state["pending"] if not self._archived(e)]
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SESSION JOURNAL — append-only record of the interactive queue for --resume
+#  One JSON object per line: a "start" header with the settings, one "track"
+#  line per queue row, then a "state" line for every transition. A line torn
+#  by a crash is simply ignored when the journal is read back.
+# ══════════════════════════════════════════════════════════════════════════════
+
+_SETTLED = {"done", "skipped", "drm"}     # never retried on --resume
+
+
+class SessionJournal:
+    """
+    Usage:
+        journal = SessionJournal(path, cfg, tracks, states)   # new run
+        journal = SessionJournal(path, cfg, tracks, states, resume=True)
+        states  = journal.states     # writes through to the journal
+        ...
+        journal.close()
+    """
+
+    def __init__(self, path: Path, cfg: dict, tracks: list[Track],
+                 states: dict[int, str], resume: bool = False) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        if not resume:
+            self._write({"ev": "start", "cfg": cfg})
+            for i, t in enumerate(tracks):
+                self._write({"ev": "track", "row": i, "url": t.url,
+                             "title": t.title, "playlist": t.playlist})
+            for row, state in states.items():
+                self.record(row, state)
+        self.states = JournaledStates(self, states)
+
+    def _write(self, event: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def record(self, row: int, state: str) -> None:
+        self._write({"ev": "state", "row": row, "state": state})
+
+    def close(self) -> None:
+        with self._lock:
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    @staticmethod
+    def load(path: Path) -> tuple[dict, list[Track], dict[int, str]] | None:
+        """
+        Replay a journal: (cfg, tracks, settled states), or None when there
+        is no journal or nothing in it is left to do.
+        """
+        try:
+            f = open(path, encoding="utf-8")
+        except OSError:
+            return None
+
+        cfg: dict | None = None
+        tracks: dict[int, Track] = {}
+        states: dict[int, str]   = {}
+        with f:
+            for line in f:
+                try:
+                    ev = json.loads(line)
+                except ValueError:
+                    continue          # torn trailing line
+                if ev["ev"] == "start":
+                    cfg = ev["cfg"]
+                elif ev["ev"] == "track":
+                    tracks[ev["row"]] = Track(ev["url"], ev["title"], ev["playlist"])
+                elif ev["ev"] == "state":
+                    states[ev["row"]] = ev["state"]
+
+        settled = {i: st for i, st in states.items() if st in _SETTLED}
+        if cfg is None or len(settled) >= len(tracks):
+            return None
+        return ({**DEFAULTS, **cfg}, [tracks[i] for i in sorted(tracks)], settled)
+
+
+class JournaledStates(dict):
+    """The row → state dict, recording every change in the journal."""
+
+    def __init__(self, journal: SessionJournal, states: dict[int, str]) -> None:
+        super().__init__(states)
+        self._journal = journal
+
+    def __setitem__(self, row: int, state: str) -> None:
+        if self.get(row) != state:
+            self._journal.record(row, state)
+        super().__setitem__(row, state)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SINGLE DOWNLOAD
+# ══════════════════════════════════════════════════════════════════════════════
+
+def download_one(url: str, session: Session, live: bool = True,
+                 handoff: Callable[[dict], None] | None = None,
+                 extra: dict | None = None,
+                 timing: TrackTiming | None = None) -> str:
+    """
+    Download audio for one URL on the calling thread's Downloader.
+    Returns: 'done' | 'skipped' | 'drm' | 'error'
+
+    live=False is used by parallel workers: no spinner or progress bar,
+    just a single result line per track so output from several workers
+    never interleaves mid-line.
+
+    With a handoff (see EncodeStage) only bestaudio is fetched here; every
+    downloaded file is passed on for post-processing instead of running the
+    ffmpeg chain inline, so 'done' means "downloaded, encode queued".
+
+    extra is the playlist context of a fanned-out entry (see Track).
+    timing, when --report is on, is filled in as the track goes.
+    """
+    archive  = session.archive
+    cache    = session.cache
+    playlist = extra is not None or "list=" in url
+    dl       = session.downloader()
+    ydl      = dl.prepare(url, playlist, live, handoff, session.panel, timing)
+
+    result   = "done"
+    title    = ""
+    streamed = False
     try:
-        with YoutubeDL(ydl_opts) as ydl:
-            if ydl.download([url]) == 101:
+        t0 = time.perf_counter()
+        if live:
+            with Spinner("resolving"):
+                info = session.resolve(ydl, url)
+        else:
+            info = session.resolve(ydl, url)
+        if timing is not None:
+            timing.extract_s = time.perf_counter() - t0
+
+        if info is None:
+            # Only happens when the archive short-circuits extraction
+            result = "skipped" if archive is not None else "error"
+        else:
+            title = info.get("title", "")
+            if live:
+                _print_track_header(info, playlist, extra)
+            if info.get("_type", "video") == "video" and (
+                    ydl.in_download_archive(info) or session.in_library(ydl, info, extra)):
                 result = "skipped"
+            else:
+                t0   = time.perf_counter()
+                info = ensure_streams(ydl, url, info, cache)
+                if timing is not None:
+                    timing.extract_s += time.perf_counter() - t0
+                    timing.title      = title
+                    timing.download_started()
+                if info is None:
+                    result = "skipped" if archive is not None else "error"
+                elif session.cfg["stream"] and dl.stream(info, extra):
+                    streamed = True
+                else:
+                    ydl.process_ie_result(info, download=True, extra_info=extra)
     except SystemExit as exc:
         result = "skipped" if exc.code == 101 else "error"
     except Exception as exc:
@@ -640,22 +3036,219 @@ def download_one(url: str, cfg: dict, archive_path: Path | None) -> str:
         else:
             _print_error(msg)
             result = "error"
+    finally:
+        dl.stages.stop()
+
+    if not live:
+        _print_result_line(result, title or url)
+        return result
 
     _ln()
-    if result == "done":
-        with Spinner("encoding  ·  embedding tags + artwork"):
-            time.sleep(0.6)
-        print(f"  {green('✓')}  {smoke('saved to')}  {white(str(music_dir))}")
+    if result == "done" and handoff and not streamed:
+        _out(f"  {green('✓')}  {smoke('downloaded  ·  encoding in background')}")
+    elif result == "done":
+        _out(f"  {green('✓')}  {smoke('saved to')}  {white(str(get_music_dir()))}")
     elif result == "skipped":
-        print(f"  {smoke('◇')}  {smoke('already in library — skipped')}")
+        _out(f"  {smoke('◇')}  {smoke('already in library — skipped')}")
     elif result == "drm":
-        print(f"  {red('⊘')}  {smoke('DRM protected — cannot download')}")
+        _out(f"  {red('⊘')}  {smoke('DRM protected — cannot download')}")
     else:
         _print_error("download failed")
 
     return result
 
 
+def _print_result_line(result: str, label: str) -> None:
+    """One-line outcome used by parallel workers."""
+    label = label if len(label) <= 54 else label[:51] + "…"
+    with _OUT_LOCK:
+        if result == "done":
+            _out(f"  {green('✓')}  {white(label)}")
+        elif result == "skipped":
+            _out(f"  {smoke('◇')}  {smoke(label)}{_NOTES['skipped']}")
+        elif result == "drm":
+            _out(f"  {red('⊘')}  {smoke(label)}{_NOTES['drm']}")
+        else:
+            _out(f"  {red('✗')}  {smoke(label)}{_NOTES['error']}")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  QUEUE RUNNERS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _run_track(i: int, track: Track, session: Session, live: bool) -> str:
+    """Download one row and return the state it settles in for now."""
+    stage   = session.stage
+    handoff = stage.handoff(i) if stage else None
+    metrics = session.metrics
+    timing  = metrics.begin(i, track.url) if metrics else None
+    if session.panel:
+        session.panel.bind(i)
+    result  = "error"
+    try:
+        result = download_one(track.url, session, live=live, handoff=handoff,
+                              extra=track.playlist, timing=timing)
+    finally:
+        session.hosts.done(track.url, ok=result != "error")
+    state   = stage.seal(i, result) if stage else result
+    if metrics and state != "encoding":
+        metrics.finish(i, state)
+    return state
+
+
+def _settle(states: dict[int, str], i: int, result: str) -> None:
+    """
+    Record a runner's outcome for row i, unless the encode stage already
+    settled it while the runner was on its way here. Call under _OUT_LOCK.
+    """
+    if states.get(i) == "active":
+        states[i] = result
+
+
+def _schedule(tracks: list[Track], session: Session,
+              states: dict[int, str]) -> HostScheduler:
+    """Queue every row the archive pre-filter has not already settled."""
+    for i, track in enumerate(tracks):
+        if i not in states:
+            session.enqueue(i, track)
+    session.hosts.close()
+    return session.hosts
+
+
+def run_serial(tracks: list[Track], session: Session,
+               queue: LiveQueue, states: dict[int, str]) -> None:
+    """One track at a time with the full spinner + progress bar display."""
+    sched = _schedule(tracks, session, states)
+    try:
+        while (job := sched.take()) is not None:
+            i, track = job
+            with _OUT_LOCK:
+                states[i] = "active"
+                queue.update(states)  # ← redrawn in place on the next frame
+
+            result = _run_track(i, track, session, live=True)
+            with _OUT_LOCK:
+                _settle(states, i, result)
+
+            _ln()
+            _rule()
+            _ln()
+    except KeyboardInterrupt:
+        _CANCEL.set()
+        for i, state in states.items():
+            if state == "active":
+                states[i] = "error"
+        queue.restore()
+        _out(f"\n\n  {smoke('cancelled.')}  {ghost('run with --resume to continue')}\n")
+
+
+def run_parallel(tracks: list[Track], session: Session,
+                 queue: LiveQueue, states: dict[int, str]) -> None:
+    """
+    Bounded worker pool: up to cfg["jobs"] tracks download at once, each
+    worker pulling its next row from the host scheduler.
+    Every state change goes through _OUT_LOCK so the queue panel and the
+    per-track result lines stay consistent.
+    """
+    def work(i: int, track: Track) -> None:
+        if _CANCEL.is_set():
+            return
+        with _OUT_LOCK:
+            states[i] = "active"
+            queue.update(states)
+        try:
+            result = _run_track(i, track, session, live=False)
+        except KeyboardInterrupt:
+            result = "error"
+        with _OUT_LOCK:
+            _settle(states, i, result)
+            queue.update(states)
+
+    def worker() -> None:
+        while (job := sched.take()) is not None:
+            work(*job)
+
+    sched   = _schedule(tracks, session, states)
+    jobs    = session.cfg["jobs"]
+    pool    = ThreadPoolExecutor(max_workers=jobs)
+    futures = [pool.submit(worker) for _ in range(jobs)]
+    try:
+        for future in as_completed(futures):
+            future.result()
+    except KeyboardInterrupt:
+        _CANCEL.set()
+        sched.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+        with _OUT_LOCK:
+            for i, state in states.items():
+                if state == "active":
+                    states[i] = "error"
+            queue.restore()
+            _out(f"\n\n  {smoke('cancelled.')}  {ghost('run with --resume to continue')}\n")
+    else:
+        pool.shutdown()
+
+
+def run_batch(urls: Iterable[str], session: Session,
+              states: dict[int, str]) -> None:
+    """
+    Headless queue for --input: URLs are pulled lazily, playlists are
+    expanded as they are reached, and at most 2 × jobs tracks are in flight
+    so memory stays flat on URL lists of any length. One line per outcome.
+    """
+    jobs  = session.cfg["jobs"]
+    slots = threading.BoundedSemaphore(jobs * 2)
+    sched = session.hosts
+    pool  = ThreadPoolExecutor(max_workers=jobs)
+
+    def work(i: int, track: Track) -> None:
+        try:
+            if _CANCEL.is_set():
+                return
+            with _OUT_LOCK:
+                states[i] = "active"
+            try:
+                result = _run_track(i, track, session, live=False)
+            except KeyboardInterrupt:
+                result = "error"
+            with _OUT_LOCK:
+                _settle(states, i, result)
+        finally:
+            slots.release()
+
+    def worker() -> None:
+        while (job := sched.take()) is not None:
+            work(*job)
+
+    for _ in range(jobs):
+        pool.submit(worker)
+    row = 0
+    try:
+        try:
+            for url in urls:
+                for track in expand_playlists([url], session):
+                    if (is_archived(track.url, session.archive)
+                            or (session.library is not None and track.url in session.library)):
+                        states[row] = "skipped"
+                        _print_result_line("skipped", track.label)
+                    else:
+                        slots.acquire()
+                        session.enqueue(row, track)
+                    row += 1
+        finally:
+            sched.close()          # workers drain what is queued, then exit
+        pool.shutdown()
+    except KeyboardInterrupt:
+        _CANCEL.set()
+        sched.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+        with _OUT_LOCK:
+            for i, state in states.items():
+                if state == "active":
+                    states[i] = "error"
+            _out(f"\n\n  {smoke('cancelled.')}\n")
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  SESSION SUMMARY
 # ══════════════════════════════════════════════════════════════════════════════
@@ -679,6 +3272,104 @@ def print_summary(states: dict[int, str]) -> None:
     _ln()
 
 
+_METRIC_ROWS = (
+    ("extract",    "extract_s",  "s"),
+    ("first byte", "ttfb_s",     "s"),
+    ("download",   "download_s", "s"),
+    ("throughput", None,         "MB/s"),
+    ("on disk",    "disk_bytes", "MB"),
+)
+
+def print_metrics(records: list[dict]) -> None:
+    """p50 / p95 table over the rows written to the --report file."""
+    if not records:
+        return
+    columns: dict[str, tuple[list[float], str]] = {}
+    for label, key, unit in _METRIC_ROWS:
+        if key is None:
+            values = [r["bytes"] / r["download_s"] / 1e6 for r in records
+                      if r["bytes"] and r["download_s"]]
+        elif unit == "MB":
+            values = [r[key] / 1e6 for r in records if r[key] is not None]
+        else:
+            values = [r[key] for r in records if r[key] is not None]
+        columns[label] = (values, unit)
+    for key in dict.fromkeys(k for r in records for k in r["stages"]):
+        values = [r["stages"][key] for r in records if key in r["stages"]]
+        columns[_PP_LABELS.get(key, key)] = (values, "s")
+
+    head = f"{'timings':<22}{'p50':>12}{'p95':>12}"
+    print(f"  {ghost(head)}")
+    for label, (values, unit) in columns.items():
+        if not values:
+            continue
+        p50 = f"{_percentile(values, 50):.2f} {unit}"
+        p95 = f"{_percentile(values, 95):.2f} {unit}"
+        print(f"  {smoke(f'{label:<22}')}{white(f'{p50:>12}')}{white(f'{p95:>12}')}")
+    _ln()
+
+
+def print_startup_time() -> None:
+    """--startup-time: what a run pays before its first extraction."""
+    steps = {"auditermix startup": time.perf_counter() - _T0}
+    new_ydl({"logger": SilentLogger()}).close()
+    steps.update(_LOAD_S)
+    _ln()
+    for label, secs in steps.items():
+        ms = f"{secs * 1000:.0f} ms"
+        print(f"  {smoke(f'{label:<22}')}{white(f'{ms:>10}')}")
+    total = f"{sum(steps.values()) * 1000:.0f} ms"
+    foot  = f"{'total':<22}{total:>10}"
+    print(f"  {ghost(foot)}")
+    _ln()
+    print(f"  {ghost('per module:  python -X importtime auditermix.py --startup-time')}")
+    _ln()
+
+
+def rebuild_archive() -> int:
+    """--rebuild-archive: downloaded.txt from the source tags in the music folder."""
+    library = LibraryIndex(get_library_path(), get_music_dir(), DEFAULTS["codec"])
+    archive = DownloadArchive(get_archive_path())
+    before  = len(archive)
+    unmatched = 0
+    try:
+        with Spinner("indexing library"):
+            library.refresh()
+        with Spinner("matching sources"):
+            for key in library.archive_ids():
+                if key is None:
+                    unmatched += 1
+                else:
+                    archive.add(key)
+        files = library.count()
+    finally:
+        library.close()
+
+    _ln()
+    print(f"  {ghost('◆')}  {white('archive rebuilt')}")
+    _ln()
+    print(f"  {green('✓')}  {bold(str(len(archive) - before))}  {smoke('added')}")
+    print(f"  {smoke('◇')}  {bold(str(len(archive)))}  {smoke('in the archive')}")
+    if unmatched:
+        print(f"  {smoke('◇')}  {bold(str(unmatched))}  {smoke('with a source no extractor claims')}")
+    _ln()
+    print(f"  {smoke('library')}  {white(str(get_music_dir()))}  {ghost(f'· {files} files')}")
+    _ln()
+    return EXIT_OK
+
+
+EXIT_OK        = 0     # everything downloaded or already in the library
+EXIT_FAILURES  = 1     # at least one track failed or was DRM protected
+EXIT_CANCELLED = 130   # Ctrl+C, same convention as the shell
+
+def exit_code(states: dict[int, str]) -> int:
+    if _CANCEL.is_set():
+        return EXIT_CANCELLED
+    if any(s in ("error", "drm") for s in states.values()):
+        return EXIT_FAILURES
+    return EXIT_OK
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  PREFLIGHT CHECK
 # ══════════════════════════════════════════════════════════════════════════════
@@ -701,47 +3392,292 @@ def check_deps() -> None:
 #  ENTRY POINT
 # ══════════════════════════════════════════════════════════════════════════════
 
-def main() -> None:
-    check_deps()
+def _job_count(raw: str) -> int:
+    n = int(raw)
+    if not 1 <= n <= MAX_JOBS:
+        raise argparse.ArgumentTypeError(f"must be between 1 and {MAX_JOBS}")
+    return n
+
+def _encoder_count(raw: str) -> int:
+    n = int(raw)
+    if n < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more")
+    return n
+
+def _fragment_count(raw: str) -> int | str:
+    if raw.lower() == "auto":
+        return "auto"
+    if not raw.isdigit() or not 1 <= int(raw) <= MAX_FRAGMENTS:
+        raise argparse.ArgumentTypeError(f"must be 'auto' or 1 – {MAX_FRAGMENTS}")
+    return int(raw)
+
+def _link_speed(raw: str) -> float:
+    n = float(raw)
+    if n <= 0:
+        raise argparse.ArgumentTypeError("must be a positive Mbit/s figure")
+    return n
+
+def _artwork_size(raw: str) -> int:
+    n = int(raw)
+    if n < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more pixels")
+    return n
+
+def _prefetch_depth(raw: str) -> int:
+    n = int(raw)
+    if n < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more")
+    return n
+
+def _quality(raw: str) -> str:
+    if not raw.isdigit() or int(raw) <= 0:
+        raise argparse.ArgumentTypeError("must be a bitrate in kbps, e.g. 192")
+    return raw
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog=__app__,
+        description="Lightning-fast command-line music engine. "
+                    "Run without arguments for the interactive prompts.",
+    )
+    parser.add_argument(
+        "-i", "--input", metavar="FILE",
+        help="batch mode: read URLs from FILE (one per line, '-' for stdin) "
+             "and skip all prompts",
+    )
+    parser.add_argument(
+        "--codec", choices=CODECS, default=DEFAULTS["codec"],
+        help=f"output codec (default {DEFAULTS['codec']})",
+    )
+    parser.add_argument(
+        "--quality", type=_quality, default=DEFAULTS["quality"], metavar="KBPS",
+        help=f"bitrate for lossy codecs (default {DEFAULTS['quality']})",
+    )
+    parser.add_argument(
+        "--thumbnail", action=argparse.BooleanOptionalAction,
+        default=DEFAULTS["thumbnail"], help="embed cover art (default on)",
+    )
+    parser.add_argument(
+        "--artwork-size", dest="artwork", type=_artwork_size,
+        default=DEFAULTS["artwork"], metavar="PX",
+        help=f"scale cover art down to PX on its longest side, "
+             f"0 keeps it as published (default {ARTWORK_PX})",
+    )
+    parser.add_argument(
+        "--dupes", dest="archive", action=argparse.BooleanOptionalAction,
+        default=DEFAULTS["archive"],
+        help="skip tracks already in the download archive (default on)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=_job_count, default=DEFAULTS["jobs"],
+        help=f"download up to N tracks in parallel (1–{MAX_JOBS}, default 1)",
+    )
+    parser.add_argument(
+        "--fragments", type=_fragment_count, default=DEFAULTS["fragments"],
+        metavar="N|auto",
+        help="concurrent DASH/HLS fragments per download; 'auto' adapts to "
+             "measured throughput (default auto)",
+    )
+    parser.add_argument(
+        "--link", type=_link_speed, default=DEFAULTS["link"], metavar="MBPS",
+        help="link capacity in Mbit/s — lets auto fragments aim for it",
+    )
+    parser.add_argument(
+        "--encoders", type=_encoder_count, default=DEFAULTS["encoders"], metavar="N",
+        help="ffmpeg post-processing processes running alongside downloads "
+             "(0 = encode inline after each download, default: CPU count)",
+    )
+    parser.add_argument(
+        "--stream", action="store_true", default=DEFAULTS["stream"],
+        help="pipe each download straight into ffmpeg so only the final file "
+             "is written (tracks that can't be streamed download normally)",
+    )
+    parser.add_argument(
+        "--prefetch", type=_prefetch_depth, default=DEFAULTS["prefetch"], metavar="N",
+        help=f"resolve up to N upcoming tracks while the current one downloads "
+             f"(0 = off, default {PREFETCH})",
+    )
+    parser.add_argument(
+        "--sync", action="store_true", default=DEFAULTS["sync"],
+        help="only queue playlist entries added since the last --sync run, "
+             "reading the playlist no further than needed",
+    )
+    parser.add_argument(
+        "--library", action="store_true", default=DEFAULTS["library"],
+        help="also skip tracks already in the music folder in the chosen codec, "
+             "found by the source URL in their tags, whatever the archive says",
+    )
+    parser.add_argument(
+        "--rebuild-archive", action="store_true",
+        help="index the music folder, add every track it finds a source for "
+             "to the download archive, then exit",
+    )
+    parser.add_argument(
+        "--no-cache", dest="cache", action="store_false",
+        help="always re-extract metadata instead of using the on-disk cache",
+    )
+    parser.add_argument(
+        "--report", type=Path, default=DEFAULTS["report"], metavar="FILE",
+        help="append per-track timings (extraction, first byte, download, "
+             "each ffmpeg stage, size on disk) to FILE as JSON Lines",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="pick up the last interactive queue where it stopped "
+             "(finished tracks are skipped without touching the network)",
+    )
+    parser.add_argument(
+        "--startup-time", action="store_true",
+        help="print how long startup and loading yt-dlp take, then exit",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"{__app__} {__version__}",
+    )
+    args = parser.parse_args(argv)
+    if args.resume and args.input:
+        parser.error("--resume reloads the last interactive queue; drop -i/--input")
+    if args.sync and not args.archive:
+        parser.error("--sync relies on the download archive; drop --no-dupes")
+    return args
+
+
+def cfg_from_args(args: argparse.Namespace) -> dict:
+    return {
+        **DEFAULTS,
+        "codec":     args.codec,
+        "quality":   args.quality,
+        "thumbnail": args.thumbnail,
+        "archive":   args.archive,
+        "jobs":      args.jobs,
+        "fragments": args.fragments,
+        "link":      args.link,
+        "encoders":  args.encoders,
+        "cache":     args.cache,
+        "report":    str(args.report) if args.report else None,
+        "artwork":   args.artwork,
+        "stream":    args.stream,
+        "prefetch":  args.prefetch,
+        "sync":      args.sync,
+        "library":   args.library,
+    }
+
 
+_CFG_FLAGS = {"archive": "dupes", "artwork": "artwork-size"}   # others: --<key>
+
+def resume_ignored(args: argparse.Namespace, cfg: dict) -> list[str]:
+    """Flags given alongside --resume that differ from the journaled settings."""
+    ignored = []
+    for key, value in cfg_from_args(args).items():
+        if value != DEFAULTS[key] and value != cfg.get(key):
+            flag = _CFG_FLAGS.get(key, key)
+            ignored.append(f"--no-{flag}" if value is False else f"--{flag}")
+    return ignored
+
+
+def main_batch(args: argparse.Namespace) -> int:
+    """--input: no splash, no prompts, exit code reflects the outcome."""
+    try:
+        source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    except OSError as exc:
+        _print_error(f"cannot read {args.input} — {exc.strerror}")
+        return EXIT_FAILURES
+    session = Session(cfg_from_args(args))
+    states: dict[int, str] = {}
+
+    def on_encoded(row: int, ok: bool) -> None:
+        with _OUT_LOCK:
+            states[row] = "done" if ok else "error"
+
+    session.start_encoder(on_encoded)
     try:
+        run_batch(iter_urls(source), session, states)
+    finally:
+        session.close()
+        if source is not sys.stdin:
+            source.close()
+
+    _ln()
+    print_summary(states)
+    if session.metrics:
+        print_metrics(session.metrics.records)
+    return exit_code(states)
+
+
+def main() -> int:
+    args = parse_args()
+    if args.startup_time:
+        print_startup_time()
+        return EXIT_OK
+    check_deps()
+    if args.rebuild_archive:
+        return rebuild_archive()
+
+    if args.input:
+        return main_batch(args)
+
+    journal_path = get_journal_path()
+    if args.resume:
+        resumed = SessionJournal.load(journal_path)
+        if resumed is None:
+            print(f"\n  {smoke('nothing to resume.')}\n")
+            return EXIT_OK
+        cfg, tracks, states = resumed
         print_splash()
-        urls = collect_urls()
-        cfg  = ask_settings(DEFAULTS)
-    except KeyboardInterrupt:
-        print(f"\n\n  {smoke('bye.')}\n")
-        sys.exit(0)
+        left = len(tracks) - len(states)
+        print(f"  {orange('◆')}  {smoke(f'resuming  ·  {left} of {len(tracks)} tracks left')}")
+        if ignored := resume_ignored(args, cfg):
+            _print_warning(f"--resume keeps the interrupted session's settings — "
+                           f"ignoring {', '.join(ignored)}")
+        session = Session(cfg)
+    else:
+        try:
+            print_splash()
+            if SessionJournal.load(journal_path) is not None:
+                print(f"  {ghost('last session did not finish — run with --resume to continue it')}")
+                _ln()
+            urls = collect_urls()
+            cfg  = ask_settings(cfg_from_args(args))
+        except KeyboardInterrupt:
+            print(f"\n\n  {smoke('bye.')}\n")
+            return EXIT_OK
 
-    archive_path = get_archive_path() if cfg["archive"] else None
-    states: dict[int, str] = {}
+        session = Session(cfg)
+        tracks  = expand_playlists(urls, session)
+        states  = prefilter([t.url for t in tracks], session.archive, session.library)
+
+    journal = SessionJournal(journal_path, cfg, tracks, states, resume=args.resume)
+    states  = journal.states
 
     # ── Draw queue once, then update it in-place throughout ──────────────────
-    queue = LiveQueue(urls)
+    queue = LiveQueue([t.label for t in tracks])
     queue.draw(states)
+    session.panel = queue
     _rule()
     _ln()
 
-    for i, url in enumerate(urls):
-        states[i] = "active"
-        queue.update(states)      # ← cursor jumps up, redraws queue, comes back
+    def on_encoded(row: int, ok: bool) -> None:
+        with _OUT_LOCK:
+            states[row] = "done" if ok else "error"
+            queue.update(states)
 
-        try:
-            states[i] = download_one(url, cfg, archive_path)
-        except KeyboardInterrupt:
-            states[i] = "error"
-            queue.restore()
-            print(f"\n\n  {smoke('cancelled.')}\n")
-            break
+    session.start_encoder(on_encoded)
+
+    if cfg["jobs"] > 1:
+        run_parallel(tracks, session, queue, states)
+    else:
+        run_serial(tracks, session, queue, states)
 
-        _ln()
-        _rule()
-        _ln()
+    session.close(spinner=True)
+    journal.close()
 
-    queue.restore()              # ← hand stdout back before summary
     queue.update(states)         # ← final state: all icons settled
+    queue.restore()              # ← flush it, hand stdout back before summary
     _ln()
     print_summary(states)
+    if session.metrics:
+        print_metrics(session.metrics.records)
+    return exit_code(states)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+auditermix offline benchmark
+
+Serves synthetic audio and a fake extractor API from a local HTTP server,
+then runs auditermix's batch queue against it once per scenario — each in
+a fresh process with its own HOME — and reports tracks/min, CPU time and
+peak RSS. Nothing touches the network, so numbers are comparable across
+releases and machines.
+
+    python bench.py                          # full matrix, 20 tracks each
+    python bench.py -n 50 --only serial,parallel-4
+    python bench.py --json results.jsonl     # append results for later diffing
+
+Needs ffmpeg (to generate the audio and for auditermix itself) and a POSIX
+system (CPU and RSS come from wait4()).
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+APP = Path(__file__).resolve().parent / "auditermix.py"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  SCENARIOS
+#  Every key is optional; missing ones fall back to _BASE.
+# ══════════════════════════════════════════════════════════════════════════════
+
+_BASE: dict = {
+    "codec":         "m4a",
+    "thumbnail":     True,
+    "jobs":          1,
+    "encoders":      os.cpu_count() or 1,
+    "archive_lines": 0,        # unrelated entries pre-seeded into the archive
+    "archived":      False,    # every track already in the archive
+    "playlist":      False,    # one playlist URL instead of N track URLs
+    "known":         0,        # playlist entries below the N new ones, already downloaded
+    "sync":          False,    # --sync, with the known entries in its saved state
+    "stream":        False,    # --stream: pipe downloads straight into ffmpeg
+    "prefetch":      None,     # --prefetch N look-ahead; None = app default
+}
+
+def _codecs() -> list[str]:
+    src = APP.read_text(encoding="utf-8")
+    return json.loads(re.search(r"^CODECS.*?=\s*(\[.*?\])", src, re.M).group(1)
+                      .replace("'", '"'))
+
+SCENARIOS: list[dict] = [
+    {"name": "serial"},
+    {"name": "no-prefetch",   "prefetch": 0},
+    {"name": "parallel-4",    "jobs": 4},
+    {"name": "inline-encode", "encoders": 0},
+    {"name": "no-thumbnail",  "thumbnail": False},
+    *({"name": f"codec-{c}", "codec": c, "thumbnail": False} for c in _codecs()),
+    {"name": "archive-10k",   "archive_lines": 10_000},
+    {"name": "archive-100k",  "archive_lines": 100_000},
+    {"name": "archive-1m",    "archive_lines": 1_000_000},
+    {"name": "all-archived",  "archived": True},
+    {"name": "playlist",      "playlist": True},
+    {"name": "playlist-3k",   "playlist": True, "known": 3000},
+    {"name": "sync-3k",       "playlist": True, "known": 3000, "sync": True},
+    {"name": "stream",        "stream": True},
+    {"name": "stream-opus",   "stream": True, "codec": "opus", "thumbnail": False},
+]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  MEDIA SERVER — static files with Range support + a tiny extractor API
+#    /media/tone.{m4a,webm}, /media/cover.jpg
+#                                          synthetic audio (AAC 128k and Opus
+#                                          160k, like YouTube) and artwork
+#    /api/track/<id>                       info dict for BenchIE
+#    /api/playlist/<n>?page=<k>            page k of an n-entry playlist for
+#                                          BenchPlaylistIE (PLAYLIST_PAGE each)
+# ══════════════════════════════════════════════════════════════════════════════
+
+def make_media(root: Path, seconds: int) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    run = ["ffmpeg", "-v", "error", "-y", "-f", "lavfi"]
+    subprocess.run(run + [
+        "-i", f"sine=frequency=440:duration={seconds}",
+        "-c:a", "aac", "-b:a", "128k",
+        "-movflags", "+frag_keyframe+empty_moov+default_base_moof",   # DASH m4a
+        str(root / "tone.m4a"),
+    ], check=True)
+    subprocess.run(run + [
+        "-i", f"sine=frequency=440:duration={seconds}",
+        "-c:a", "libopus", "-b:a", "160k", str(root / "tone.webm"),
+    ], check=True)
+    subprocess.run(run + [
+        "-i", "color=c=orange:s=480x480", "-frames:v", "1", str(root / "cover.jpg"),
+    ], check=True)
+
+
+PLAYLIST_PAGE = 100        # entries per playlist page, like YouTube
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    latency = 0.0          # seconds added to every API response
+    rate    = 0.0          # bytes/s per media response, 0 = unthrottled
+
+    def log_message(self, *_) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/api/"):
+            return self._api()
+        if not self.path.startswith("/media/"):
+            return self.send_error(404)
+        self.path = self.path[len("/media"):]
+        path = self.translate_path(self.path)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return self.send_error(404)
+        with f:
+            size  = os.fstat(f.fileno()).st_size
+            start, end = 0, size - 1
+            m = re.match(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+            if m and m.group(1):
+                start = int(m.group(1))
+                end   = min(int(m.group(2) or end), end)
+            self.send_response(206 if m else 200)
+            self.send_header("Content-Type", self.guess_type(path))
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            if m:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            f.seek(start)
+            left = end - start + 1
+            while left > 0 and (data := f.read(min(left, 1 << 16))):
+                self.wfile.write(data)
+                left -= len(data)
+                if self.rate:
+                    time.sleep(len(data) / self.rate)
+
+    def _api(self) -> None:
+        time.sleep(self.latency)
+        base = f"http://{self.headers['Host']}"
+        path, _, query = self.path.partition("?")
+        kind, _, ident = path[len("/api/"):].partition("/")
+        if kind == "track":
+            body = {
+                "id":       ident,
+                "title":    f"bench {ident}",
+                "artist":   "auditermix bench",
+                "album":    "synthetic",
+                "formats": [{
+                    "format_id": "140", "url": f"{base}/media/tone.m4a",
+                    "ext": "m4a", "acodec": "mp4a.40.2", "vcodec": "none", "abr": 128,
+                    "container": "m4a_dash",
+                }, {
+                    "format_id": "251", "url": f"{base}/media/tone.webm",
+                    "ext": "webm", "acodec": "opus", "vcodec": "none", "abr": 160,
+                }],
+                # best first-choice missing, like YouTube's guessed maxresdefault
+                "thumbnails": [{"url": f"{base}/media/cover.jpg"},
+                               {"url": f"{base}/media/maxresdefault.jpg"}],
+            }
+        elif kind == "playlist" and ident.isdigit():
+            page  = int(re.search(r"page=(\d+)", query or "page=0").group(1))
+            first = page * PLAYLIST_PAGE
+            body = {
+                "id":      f"pl{ident}",
+                "title":   "bench playlist",
+                "count":   int(ident),
+                "entries": [f"{base}/watch?v=p{i:05d}"
+                            for i in range(first, min(first + PLAYLIST_PAGE, int(ident)))],
+            }
+        else:
+            return self.send_error(404)
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(root: Path, latency: float, rate: float = 0.0) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"latency": latency, "rate": rate})
+    server  = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        lambda *a: handler(*a, directory=str(root)),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  CHILD — one scenario, run inside a fresh interpreter
+#  Registers the bench extractors ahead of yt-dlp's own (so they win the URL
+#  match), then hands over to auditermix.main() exactly as the CLI would.
+# ══════════════════════════════════════════════════════════════════════════════
+
+def child(argv: list[str]) -> int:
+    from yt_dlp.extractor import import_extractors
+    from yt_dlp.extractor.common import InfoExtractor
+    from yt_dlp.globals import extractors
+    from yt_dlp.utils import OnDemandPagedList
+
+    host = r"https?://127\.0\.0\.1:\d+"
+
+    class BenchIE(InfoExtractor):
+        _VALID_URL = rf"(?P<base>{host})/watch\?v=(?P<id>[\w-]+)"
+
+        def _real_extract(self, url):
+            base, ident = self._match_valid_url(url).group("base", "id")
+            return self._download_json(f"{base}/api/track/{ident}", ident)
+
+    class BenchPlaylistIE(InfoExtractor):
+        _VALID_URL = rf"(?P<base>{host})/playlist\?list=(?P<id>\d+)"
+
+        def _real_extract(self, url):
+            base, ident = self._match_valid_url(url).group("base", "id")
+
+            def page(n: int) -> list[dict]:
+                data = self._download_json(f"{base}/api/playlist/{ident}?page={n}", ident)
+                return [self.url_result(u, BenchIE, u.rpartition("=")[2])
+                        for u in data["entries"]]
+
+            head = self._download_json(f"{base}/api/playlist/{ident}?page=0", ident)
+            return self.playlist_result(OnDemandPagedList(page, PLAYLIST_PAGE),
+                                        head["id"], head["title"],
+                                        playlist_count=head["count"])
+
+    import_extractors()
+    extractors.value = {"BenchIE": BenchIE, "BenchPlaylistIE": BenchPlaylistIE,
+                        **extractors.value}
+
+    sys.path.insert(0, str(APP.parent))
+    import auditermix
+    sys.argv = ["auditermix", *argv]
+    return auditermix.main()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  RUNNER
+# ══════════════════════════════════════════════════════════════════════════════
+
+def _prepare(spec: dict, home: Path, base: str, tracks: int) -> list[str]:
+    """Write the URL list and archive for spec; returns auditermix argv."""
+    cache = home / ".cache" / "auditermix"
+    cache.mkdir(parents=True)
+
+    ids   = [f"t{i:05d}" for i in range(tracks)]
+    known = [f"p{i:05d}" for i in range(tracks, tracks + spec["known"])]
+    urls  = ([f"{base}/playlist?list={tracks + len(known)}"] if spec["playlist"] else
+             [f"{base}/watch?v={i}" for i in ids])
+    (home / "urls.txt").write_text("\n".join(urls) + "\n")
+
+    with open(cache / "downloaded.txt", "w") as f:
+        for n in range(spec["archive_lines"]):
+            f.write(f"youtube {n:011d}\n")
+        if spec["archived"]:
+            f.writelines(f"bench {i}\n" for i in ids)
+        f.writelines(f"bench {i}\n" for i in known)
+    if spec["sync"]:
+        # as left by an earlier --sync run that saw only the known entries
+        (cache / "playlists.json").write_text(json.dumps({
+            f"benchplaylist pl{tracks + len(known)}": {
+                "count": len(known), "ids": known, "walked": time.time(), "pending": [],
+            },
+        }))
+
+    return [
+        "-i", str(home / "urls.txt"),
+        "--codec", spec["codec"],
+        "--jobs", str(spec["jobs"]),
+        "--encoders", str(spec["encoders"]),
+        "--thumbnail" if spec["thumbnail"] else "--no-thumbnail",
+        *(["--stream"] if spec["stream"] else []),
+        *(["--sync"] if spec["sync"] else []),
+        *(["--prefetch", str(spec["prefetch"])] if spec["prefetch"] is not None else []),
+    ]
+
+
+def run_scenario(spec: dict, base: str, tracks: int, keep: bool) -> dict:
+    spec = {**_BASE, **spec}
+    home = Path(tempfile.mkdtemp(prefix=f"auditermix-bench-{spec['name']}-"))
+    argv = _prepare(spec, home, base, tracks)
+
+    env = {**os.environ, "HOME": str(home)}
+    env.pop("XDG_CACHE_HOME", None)
+    with open(home / "output.log", "w") as log:
+        t0   = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, __file__, "--child", *argv],
+            env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - t0
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    rss_unit = 1 << 20 if sys.platform == "darwin" else 1 << 10   # bytes vs KiB
+    result = {
+        "scenario":   spec["name"],
+        "tracks":     tracks,
+        "exit":       proc.returncode,
+        "wall_s":     round(wall, 3),
+        "tracks_min": round(tracks * 60 / wall, 1),
+        "cpu_s":      round(usage.ru_utime + usage.ru_stime, 3),
+        "rss_mb":     round(usage.ru_maxrss * rss_unit / (1 << 20), 1),
+    }
+    if keep or proc.returncode:
+        result["home"] = str(home)        # left behind for a look at output.log
+    else:
+        shutil.rmtree(home, ignore_errors=True)
+    return result
+
+
+def _version() -> str:
+    m = re.search(r'^__version__\s*=\s*"(.+?)"', APP.read_text(encoding="utf-8"), re.M)
+    return m.group(1) if m else "?"
+
+
+def main() -> int:
+    if sys.argv[1:2] == ["--child"]:
+        return child(sys.argv[2:])
+
+    names  = [s["name"] for s in SCENARIOS]
+    parser = argparse.ArgumentParser(description="Offline auditermix benchmark.")
+    parser.add_argument("-n", "--tracks", type=int, default=20, metavar="N",
+                        help="tracks per scenario (default 20)")
+    parser.add_argument("--seconds", type=int, default=180, metavar="S",
+                        help="length of the synthetic track (default 180)")
+    parser.add_argument("--latency", type=float, default=0.0, metavar="MS",
+                        help="delay added to every extractor API call")
+    parser.add_argument("--rate", type=float, default=0.0, metavar="MBPS",
+                        help="cap each media response at MBPS Mbit/s (default unlimited)")
+    parser.add_argument("--only", metavar="A,B",
+                        help="comma-separated subset of: " + ", ".join(names))
+    parser.add_argument("--json", type=Path, metavar="FILE",
+                        help="append one JSON line per scenario to FILE")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep each scenario's HOME (music, archive, log)")
+    args = parser.parse_args()
+
+    chosen = SCENARIOS
+    if args.only:
+        wanted  = set(args.only.split(","))
+        unknown = wanted - set(names)
+        if unknown:
+            parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+        chosen = [s for s in SCENARIOS if s["name"] in wanted]
+    if shutil.which("ffmpeg") is None:
+        parser.error("ffmpeg is required")
+
+    with tempfile.TemporaryDirectory(prefix="auditermix-bench-media-") as media:
+        make_media(Path(media), args.seconds)
+        server = serve(Path(media), args.latency / 1000, args.rate * 125_000)
+        base   = f"http://127.0.0.1:{server.server_address[1]}"
+
+        version = _version()
+        print(f"auditermix {version} · {args.tracks} tracks · "
+              f"{args.seconds}s synthetic audio\n")
+        print(f"{'scenario':<16}{'wall s':>9}{'tracks/min':>12}{'cpu s':>9}{'rss MB':>9}")
+        failed = False
+        for spec in chosen:
+            r = run_scenario(spec, base, args.tracks, args.keep)
+            note = f"  exit {r['exit']} — see {r['home']}" if r["exit"] else ""
+            print(f"{r['scenario']:<16}{r['wall_s']:>9.2f}{r['tracks_min']:>12.1f}"
+                  f"{r['cpu_s']:>9.2f}{r['rss_mb']:>9.1f}{note}", flush=True)
+            failed |= bool(r["exit"])
+            if args.json:
+                with open(args.json, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"version": version, **r}) + "\n")
+        server.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())